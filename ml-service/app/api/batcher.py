@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import numpy as np
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..models.signal_classifier import SignalClassifier
+from ..features.normalizer import N_FEATURES
+
+# Upper bound on rows coalesced into one model call
+MAX_BATCH = 64
+# How long the first request of a batch waits for company
+MAX_WAIT_MS = 3
+
+# Per-thread (MAX_BATCH, n_features) staging buffer for stacking batches
+_BUF = threading.local()
+
+
+def _get_buf(n_rows: int) -> np.ndarray:
+    """Reusable float32 rows owned by the calling (executor) thread"""
+    buf = getattr(_BUF, "x", None)
+    if buf is None or buf.shape[0] < n_rows:
+        buf = _BUF.x = np.zeros((max(n_rows, MAX_BATCH), N_FEATURES), dtype=np.float32)
+    return buf[:n_rows]
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-signal predictions into batched model calls"""
+
+    def __init__(
+        self,
+        classifier: SignalClassifier,
+        executor: Optional[Executor] = None,
+        max_batch: int = MAX_BATCH,
+        max_wait_ms: float = MAX_WAIT_MS,
+    ):
+        self.classifier = classifier
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_flight: Set[asyncio.Task] = set()
+
+    async def submit(self, features_array: np.ndarray) -> Dict:
+        """Queue one (1, n_features) row and wait for its detailed prediction"""
+        loop = asyncio.get_running_loop()
+        self._ensure_worker(loop)
+
+        future = loop.create_future()
+        await self._queue.put((features_array, future))
+        return await future
+
+    async def close(self) -> None:
+        """Stop the drain task"""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+    def _ensure_worker(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start the drain task on the current loop (restarts if the loop changed)"""
+        if self._loop is loop and self._worker is not None and not self._worker.done():
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Keep collecting the next batch while this one runs on the executor
+            task = loop.create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[np.ndarray, asyncio.Future]]) -> None:
+        """Run one model call for the batch and hand each waiter its row"""
+        loop = asyncio.get_running_loop()
+        try:
+            if len(batch) == 1:
+                # A lone request takes the cached single-row path
+                features, future = batch[0]
+                result = await loop.run_in_executor(
+                    self.executor, self.classifier.predict_detailed, features
+                )
+                if not future.done():
+                    future.set_result(result)
+                return
+
+            rows = [features for features, _ in batch]
+            results = await loop.run_in_executor(self.executor, self._predict_rows, rows)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for i, (_, future) in enumerate(batch):
+            if future.done():  # Caller went away
+                continue
+            future.set_result({
+                "win_probability": float(results["win_probability"][i]),
+                "quality_tier": results["quality_tier"][i],
+                "confidence": float(results["confidence"][i]),
+                "should_filter": bool(results["should_filter"][i]),
+                "xgboost_prob": float(results["xgboost_prob"][i]),
+                "lightgbm_prob": float(results["lightgbm_prob"][i]),
+                "model_version": results["model_version"],
+            })
+
+    def _predict_rows(self, rows: List[np.ndarray]) -> Dict:
+        """Stack rows into this thread's buffer and run one batched prediction"""
+        features = _get_buf(len(rows))
+        for i, row in enumerate(rows):
+            features[i] = row
+        # Results are fresh arrays, so the buffer is free again once this returns
+        return self.classifier.predict_detailed_batch(features)
@@ -0,0 +1,76 @@
+import numpy as np
+import orjson
+from fastapi.responses import Response
+from typing import Any, Dict, List, Optional
+
+from ..models.signal_classifier import TIER_LABELS
+
+# One record per signal; signal ids are free-form strings, so they stay as objects
+PREDICTION_DTYPE = np.dtype([
+    ("signal_id", object),
+    ("win_probability", "f4"),
+    ("xgboost_prob", "f4"),
+    ("lightgbm_prob", "f4"),
+    ("tier", "u1"),
+    ("confidence", "f4"),
+    ("should_filter", "?"),
+])
+
+
+def build_prediction_array(signal_ids: List[str], results: Dict) -> np.ndarray:
+    """Pack predict_detailed_batch output into a PREDICTION_DTYPE record array"""
+    predictions = np.empty(len(signal_ids), dtype=PREDICTION_DTYPE)
+    predictions["signal_id"] = signal_ids
+    predictions["win_probability"] = results["win_probability"]
+    predictions["xgboost_prob"] = results["xgboost_prob"]
+    predictions["lightgbm_prob"] = results["lightgbm_prob"]
+    predictions["tier"] = results["tier_index"]
+    predictions["confidence"] = results["confidence"]
+    predictions["should_filter"] = results["should_filter"]
+    return predictions
+
+
+class PredictionArrayResponse(Response):
+    """
+    Renders a PREDICTION_DTYPE array in the PredictBatchResponse JSON shape.
+
+    Bypasses response_model serialization, so no MLPrediction objects are built.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, content: np.ndarray, model_version: Optional[str] = None, **kwargs: Any):
+        self.model_version = model_version
+        super().__init__(content, **kwargs)
+
+    def render(self, content: np.ndarray) -> bytes:
+        # Pull each column out as Python scalars once, then zip rows back together
+        rows = zip(
+            content["signal_id"].tolist(),
+            content["win_probability"].tolist(),
+            TIER_LABELS[content["tier"]].tolist(),
+            content["confidence"].tolist(),
+            content["should_filter"].tolist(),
+            content["xgboost_prob"].tolist(),
+            content["lightgbm_prob"].tolist(),
+        )
+        model_version = self.model_version
+
+        predictions = {
+            signal_id: {
+                "signal_id": signal_id,
+                "win_probability": win_probability,
+                "quality_tier": quality_tier,
+                "confidence": confidence,
+                "should_filter": should_filter,
+                "model_version": model_version,
+                "xgboost_prob": xgboost_prob,
+                "lightgbm_prob": lightgbm_prob,
+            }
+            for (
+                signal_id, win_probability, quality_tier, confidence,
+                should_filter, xgboost_prob, lightgbm_prob,
+            ) in rows
+        }
+
+        return orjson.dumps({"predictions": predictions})
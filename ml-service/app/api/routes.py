@@ -1,14 +1,18 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import Dict, List
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Request
+from typing import Dict, List, Union
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+import msgspec
 import numpy as np
-import pandas as pd
 from io import StringIO
-import traceback
 
 from .schemas import (
     SignalFeatures,
+    SignalFeaturesStruct,
     MLPrediction,
-    PredictRequest,
+    PredictRequestStruct,
     PredictBatchRequest,
     PredictResponse,
     PredictBatchResponse,
@@ -17,10 +21,12 @@ from .schemas import (
     ModelStats,
     QualityTier,
 )
+from .batcher import MicroBatcher
+from .responses import PredictionArrayResponse, build_prediction_array
 from ..models.signal_classifier import SignalClassifier
 from ..training.trainer import Trainer
 from ..features.normalizer import FeatureNormalizer
-from ..config import FEATURE_NAMES
+from ..config import FEATURE_NAMES, SERVER_WORKERS
 
 router = APIRouter()
 
@@ -28,14 +34,69 @@ router = APIRouter()
 classifier = SignalClassifier()
 trainer = Trainer(classifier)
 
+# Model calls run here so they don't block the event loop; worker processes split the cores
+CPU_POOL_SIZE = max(1, (os.cpu_count() or 1) // SERVER_WORKERS)
+CPU_POOL = ThreadPoolExecutor(max_workers=CPU_POOL_SIZE, thread_name_prefix="predict")
+batcher = MicroBatcher(classifier, executor=CPU_POOL)
 
-def features_to_array(features: SignalFeatures) -> np.ndarray:
+
+async def warmup_pool():
+    """Warm every predict thread (ONNX bindings are per thread) before traffic arrives"""
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*[
+        loop.run_in_executor(CPU_POOL, classifier.warmup)
+        for _ in range(CPU_POOL_SIZE)
+    ])
+
+
+_feature_values = attrgetter(*FEATURE_NAMES)
+
+# Reused msgspec decoder for /predict bodies; lax like Pydantic, so "70" and 1.0
+# are accepted for float and int fields
+_predict_decoder = msgspec.json.Decoder(PredictRequestStruct, strict=False)
+
+
+def features_to_array(features: Union[SignalFeatures, SignalFeaturesStruct]) -> np.ndarray:
     """Convert SignalFeatures to numpy array"""
-    return FeatureNormalizer.features_dict_to_array(features.model_dump())
+    # Every field is present on both models, so read attributes directly
+    return FeatureNormalizer.features_tuple_to_array(_feature_values(features))
 
 
-@router.post("/predict", response_model=PredictResponse)
-async def predict_single(request: PredictRequest):
+async def decode_predict_request(request: Request) -> PredictRequestStruct:
+    """
+    Decode a /predict body with msgspec instead of Pydantic validation.
+
+    Invalid bodies still return 422, but detail is msgspec's message string
+    (e.g. "Expected `float`, got `str` - at `$.features.rsi_1h`") rather than
+    FastAPI's list of error objects.
+    """
+    try:
+        return _predict_decoder.decode(await request.body())
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.post(
+    "/predict",
+    response_model=PredictResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "object",
+                        "required": ["features"],
+                        "properties": {
+                            "features": {"$ref": "#/components/schemas/SignalFeatures"}
+                        },
+                    }
+                }
+            },
+        }
+    },
+)
+async def predict_single(request: PredictRequestStruct = Depends(decode_predict_request)):
     """Predict win probability for a single signal"""
     if not classifier.is_loaded:
         raise HTTPException(
@@ -43,25 +104,22 @@ async def predict_single(request: PredictRequest):
             detail="Model not loaded. Train a model first or wait for model to load."
         )
 
-    try:
-        features_array = features_to_array(request.features)
-        result = classifier.predict_detailed(features_array)
-
-        prediction = MLPrediction(
-            signal_id=request.features.signal_id,
-            win_probability=result["win_probability"],
-            quality_tier=QualityTier(result["quality_tier"]),
-            confidence=result["confidence"],
-            should_filter=result["should_filter"],
-            model_version=result["model_version"],
-            xgboost_prob=result["xgboost_prob"],
-            lightgbm_prob=result["lightgbm_prob"],
-        )
+    features_array = features_to_array(request.features)
+    result = await batcher.submit(features_array)
 
-        return PredictResponse(prediction=prediction)
+    # Values come from the classifier, so skip field validation on the way out
+    prediction = MLPrediction.model_construct(
+        signal_id=request.features.signal_id,
+        win_probability=result["win_probability"],
+        quality_tier=QualityTier(result["quality_tier"]),
+        confidence=result["confidence"],
+        should_filter=result["should_filter"],
+        model_version=result["model_version"],
+        xgboost_prob=result["xgboost_prob"],
+        lightgbm_prob=result["lightgbm_prob"],
+    )
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return PredictResponse.model_construct(prediction=prediction)
 
 
 @router.post("/predict/batch", response_model=PredictBatchResponse)
@@ -73,129 +131,103 @@ async def predict_batch(request: PredictBatchRequest):
             detail="Model not loaded. Train a model first or wait for model to load."
         )
 
-    try:
-        predictions = {}
-
-        for features in request.features_list:
-            features_array = features_to_array(features)
-            result = classifier.predict_detailed(features_array)
+    if not request.features_list:
+        return PredictBatchResponse(predictions={})
 
-            predictions[features.signal_id] = MLPrediction(
-                signal_id=features.signal_id,
-                win_probability=result["win_probability"],
-                quality_tier=QualityTier(result["quality_tier"]),
-                confidence=result["confidence"],
-                should_filter=result["should_filter"],
-                model_version=result["model_version"],
-                xgboost_prob=result["xgboost_prob"],
-                lightgbm_prob=result["lightgbm_prob"],
-            )
+    features_matrix = FeatureNormalizer.features_list_to_matrix(
+        [features.__dict__ for features in request.features_list]
+    )
+    results = await asyncio.get_running_loop().run_in_executor(
+        CPU_POOL, classifier.predict_detailed_batch, features_matrix
+    )
 
-        return PredictBatchResponse(predictions=predictions)
+    predictions = build_prediction_array(
+        [features.signal_id for features in request.features_list], results
+    )
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return PredictionArrayResponse(predictions, model_version=results["model_version"])
 
 
 @router.post("/train", response_model=TrainResponse)
-async def train_model(request: TrainRequest, background_tasks: BackgroundTasks):
+def train_model(request: TrainRequest, background_tasks: BackgroundTasks):
     """Train or retrain the model"""
-    try:
-        # Train from provided data or CSV path
-        if request.training_data:
-            # Convert to format expected by trainer
-            training_data = [
-                {
-                    "signal_id": d.signal_id,
-                    "features": d.features,
-                    "outcome": d.outcome,
-                }
-                for d in request.training_data
-            ]
-            result = trainer.train_from_data(training_data)
-
-        elif request.csv_path:
-            result = trainer.train_from_csv(request.csv_path)
-
-        else:
-            raise HTTPException(
-                status_code=400,
-                detail="Provide either 'training_data' or 'csv_path'"
-            )
-
-        return TrainResponse(
-            status=result["status"],
-            model_version=result["model_version"],
-            training_samples=result["training_samples"],
-            validation_auc=result["validation_auc"],
-            validation_accuracy=result["validation_accuracy"],
-            feature_importance=result["feature_importance"],
-            message=f"Model trained successfully with {result['training_samples']} samples",
+    # Train from provided data or CSV path
+    if request.training_data:
+        # Convert to format expected by trainer
+        training_data = [
+            {
+                "signal_id": d.signal_id,
+                "features": d.features,
+                "outcome": d.outcome,
+            }
+            for d in request.training_data
+        ]
+        result = trainer.train_from_data(training_data)
+
+    elif request.csv_path:
+        result = trainer.train_from_csv(request.csv_path)
+
+    elif request.parquet_paths:
+        result = trainer.train_from_parquet(request.parquet_paths)
+
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail="Provide 'training_data', 'csv_path' or 'parquet_paths'"
         )
 
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
+    return TrainResponse(
+        status=result["status"],
+        model_version=result["model_version"],
+        training_samples=result["training_samples"],
+        validation_auc=result["validation_auc"],
+        validation_accuracy=result["validation_accuracy"],
+        feature_importance=result["feature_importance"],
+        message=f"Model trained successfully with {result['training_samples']} samples",
+    )
 
 
-@router.post("/train/csv")
-async def train_from_csv_body(csv_data: str):
+@router.post("/train/csv", response_model=TrainResponse)
+def train_from_csv_body(csv_data: str):
     """Train model from CSV data in request body"""
-    try:
-        df = pd.read_csv(StringIO(csv_data))
-        result = trainer._train_from_dataframe(df)
-
-        return TrainResponse(
-            status=result["status"],
-            model_version=result["model_version"],
-            training_samples=result["training_samples"],
-            validation_auc=result["validation_auc"],
-            validation_accuracy=result["validation_accuracy"],
-            feature_importance=result["feature_importance"],
-            message=f"Model trained successfully with {result['training_samples']} samples",
-        )
+    result = trainer.train_from_csv_stream(StringIO(csv_data))
 
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
+    return TrainResponse(
+        status=result["status"],
+        model_version=result["model_version"],
+        training_samples=result["training_samples"],
+        validation_auc=result["validation_auc"],
+        validation_accuracy=result["validation_accuracy"],
+        feature_importance=result["feature_importance"],
+        message=f"Model trained successfully with {result['training_samples']} samples",
+    )
 
 
-@router.post("/train/sqlite-data")
-async def train_from_sqlite_data(signal_features: List[Dict]):
+@router.post("/train/sqlite-data", response_model=TrainResponse)
+def train_from_sqlite_data(signal_features: List[Dict]):
     """Train model from SQLite signal_features data"""
-    try:
-        result = trainer.train_from_sqlite_data(signal_features)
-
-        return TrainResponse(
-            status=result["status"],
-            model_version=result["model_version"],
-            training_samples=result["training_samples"],
-            validation_auc=result["validation_auc"],
-            validation_accuracy=result["validation_accuracy"],
-            feature_importance=result["feature_importance"],
-            message=f"Model trained successfully with {result['training_samples']} samples",
-        )
+    result = trainer.train_from_sqlite_data(signal_features)
 
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
+    return TrainResponse(
+        status=result["status"],
+        model_version=result["model_version"],
+        training_samples=result["training_samples"],
+        validation_auc=result["validation_auc"],
+        validation_accuracy=result["validation_accuracy"],
+        feature_importance=result["feature_importance"],
+        message=f"Model trained successfully with {result['training_samples']} samples",
+    )
 
 
 @router.get("/stats", response_model=ModelStats)
-async def get_model_stats():
+def get_model_stats():
     """Get model statistics"""
     stats = classifier.get_stats()
     return ModelStats(**stats)
 
 
 @router.get("/features")
-async def get_feature_names():
+def get_feature_names():
     """Get list of feature names in order"""
     return {
         "feature_names": FEATURE_NAMES,
@@ -206,8 +238,10 @@ async def get_feature_names():
 @router.post("/reload")
 async def reload_model():
     """Reload model from disk"""
-    success = classifier.load()
+    loop = asyncio.get_running_loop()
+    success = await loop.run_in_executor(CPU_POOL, classifier.load)
     if success:
+        await warmup_pool()
         return {"status": "success", "model_version": classifier.model_version}
     else:
         return {"status": "no_model", "message": "No saved model found"}
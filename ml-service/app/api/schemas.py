@@ -1,3 +1,4 @@
+import msgspec
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional, Any
 from enum import Enum
@@ -73,6 +74,74 @@ class SignalFeatures(BaseModel):
     direction: int = 1  # 1 = LONG, -1 = SHORT
 
 
+class SignalFeaturesStruct(msgspec.Struct):
+    """msgspec mirror of SignalFeatures for the /predict hot path (keep in sync)"""
+    signal_id: str
+    symbol: str
+
+    # Price features
+    price_change_24h: float = 0.0
+    price_change_1h: float = 0.0
+    price_change_15m: float = 0.0
+    price_change_5m: float = 0.0
+    high_low_range: float = 0.0
+    price_position: float = 0.5
+
+    # Volume features
+    volume_quote_24h: float = 0.0
+    volume_multiplier: float = 1.0
+    volume_change_1h: float = 0.0
+
+    # Momentum features
+    velocity: float = 0.0
+    acceleration: float = 0.0
+    trend_state: int = 0
+
+    # Technical features
+    rsi_1h: float = 50.0
+    mtf_alignment: int = 0
+    divergence_type: int = 0
+
+    # Funding features
+    funding_rate: float = 0.0
+    funding_signal: int = 0
+    funding_direction_match: int = 0
+
+    # Open Interest features
+    oi_change_percent: float = 0.0
+    oi_signal: int = 0
+    oi_price_alignment: int = 0
+
+    # Pattern features
+    pattern_type: int = 0
+    pattern_confidence: float = 0.0
+    distance_from_level: float = 0.0
+
+    # Smart Signal features
+    smart_confidence: float = 0.0
+    component_count: int = 0
+    entry_type: int = 0
+    risk_level: int = 1
+
+    # Entry timing features
+    atr_percent: float = 0.0
+    vwap_distance: float = 0.0
+    risk_reward_ratio: float = 1.5
+
+    # Whale/Correlation features
+    whale_activity: float = 0.0
+    btc_correlation: float = 0.0
+    btc_outperformance: float = 0.0
+
+    # Direction
+    direction: int = 1  # 1 = LONG, -1 = SHORT
+
+
+class PredictRequestStruct(msgspec.Struct):
+    """msgspec mirror of PredictRequest, decoded straight from the request body"""
+    features: SignalFeaturesStruct
+
+
 class MLPrediction(BaseModel):
     """ML prediction result"""
     signal_id: str
@@ -116,6 +185,7 @@ class TrainRequest(BaseModel):
     """Training request with data"""
     training_data: Optional[List[TrainingData]] = None
     csv_path: Optional[str] = None
+    parquet_paths: Optional[List[str]] = None  # Shards in chronological order
 
 
 class TrainResponse(BaseModel):
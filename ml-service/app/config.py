@@ -15,6 +15,13 @@ MODEL_CONFIG = {
     "min_training_samples": 500,
     "validation_split": 0.2,
     "random_state": 42,
+    "inference_backend": "onnx",  # "onnx", "treelite", "kernel" (fused C ensemble) or "native"
+    "prediction_cache_size": 4096,  # Recently seen single-row predictions kept in memory
+    "prediction_cache_decimals": None,  # Round inputs to this many decimals before scoring; near-duplicates share cache entries
+    "ensemble_early_exit_margin": None,  # Native backend: skip LightGBM when |p_xgb - 0.5| exceeds this
+    "parallel_booster_min_rows": 1024,  # Native backend: score XGBoost on a side thread from this batch size
+    "refit_on_full_data": True,  # False serves the last CV fold's models and skips the refit
+    "external_memory": False,  # Parquet training: stream shards through disk instead of loading them all
 }
 
 # XGBoost parameters
@@ -103,3 +110,8 @@ QUALITY_TIERS = {
 # Server configuration
 SERVER_HOST = os.getenv("ML_HOST", "0.0.0.0")
 SERVER_PORT = int(os.getenv("ML_PORT", "8001"))
+# Worker processes for run.py; ENV=dev always runs one auto-reloading worker.
+# With several workers, each polls MODEL_DIR for models saved by the others.
+SERVER_WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))
+MODEL_POLL_SECONDS = 5.0
+DEV_MODE = os.getenv("ENV") == "dev"
@@ -0,0 +1,51 @@
+import numpy as np
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; FeatureNormalizer falls back to NumPy
+    NUMBA_AVAILABLE = False
+
+# fastmath minus "nnan"/"ninf": unclipped columns use infinite bounds and NaNs must pass through
+_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+if NUMBA_AVAILABLE:
+
+    # Serial: calls come from the API's CPU pool threads, which already provide the
+    # concurrency (parallel=True would start a thread team per call)
+    @njit(fastmath=_FASTMATH, cache=True)
+    def normalize_rows(x_in, x_out, lo, hi, offset, scale, log_col):
+        """Fused clip / shift / log1p / scale of every row of x_in into x_out"""
+        n_rows, n_cols = x_in.shape
+        for i in range(n_rows):
+            for j in range(n_cols):
+                v = x_in[i, j]
+                if v < lo[j]:
+                    v = lo[j]
+                elif v > hi[j]:
+                    v = hi[j]
+                v -= offset[j]
+                if j == log_col:
+                    v = np.log1p(v)
+                x_out[i, j] = v * scale[j]
+
+    @njit(cache=True)
+    def robust_scale_rows(x_in, x_out, center, scale):
+        """(x - center) / scale of every row of x_in into x_out in a single pass"""
+        # No fastmath: matches FeatureNormalizer's float32 NumPy fallback exactly
+        n_rows, n_cols = x_in.shape
+        for i in range(n_rows):
+            for j in range(n_cols):
+                x_out[i, j] = (x_in[i, j] - center[j]) / scale[j]
+
+    # Compile the float32 specializations at import so the first request doesn't pay for them
+    _warmup = np.zeros((1, 1), dtype=np.float32)
+    _bounds = np.zeros(1, dtype=np.float32)
+    normalize_rows(_warmup, np.empty_like(_warmup), _bounds, _bounds, _bounds, _bounds, 0)
+    robust_scale_rows(_warmup, np.empty_like(_warmup), _bounds, _bounds + 1)
+
+else:
+    normalize_rows = None
+    robust_scale_rows = None
@@ -1,10 +1,90 @@
 import numpy as np
-from typing import List, Dict, Any
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, Dict, Any, Optional
 from sklearn.preprocessing import StandardScaler, RobustScaler
 import joblib
 from pathlib import Path
 
 from ..config import FEATURE_NAMES, MODEL_DIR
+from ._scale_numba import NUMBA_AVAILABLE, normalize_rows, robust_scale_rows
+
+# Value used when a feature is missing from the input (0 unless listed)
+FEATURE_DEFAULTS = {
+    "price_position": 0.5,
+    "volume_multiplier": 1,
+    "rsi_1h": 50,
+    "risk_level": 1,
+    "risk_reward_ratio": 1.5,
+    "direction": 1,
+}
+
+N_FEATURES = len(FEATURE_NAMES)
+
+# (name, default) pairs in model input order, plus a fast path for complete dicts
+_GETTERS = tuple((name, FEATURE_DEFAULTS.get(name, 0)) for name in FEATURE_NAMES)
+_get_all_features = itemgetter(*FEATURE_NAMES)
+
+
+@lru_cache(maxsize=4096)
+def _convert_tuple(values: tuple) -> np.ndarray:
+    """Feature row for an ordered tuple of values; shared between hits, so read-only"""
+    row = np.fromiter(values, dtype=np.float32, count=N_FEATURES).reshape(1, -1)
+    row.flags.writeable = False
+    return row
+
+
+# Manual scaling bounds per column: clip to [lo, hi], subtract offset, multiply
+# by scale. Columns without an entry pass through unchanged.
+_MANUAL_SCALING = {
+    # Price changes: clip to [-100, 100], scale to [-1, 1]
+    "price_change_24h": (-100, 100, 0, 1 / 100),
+    "price_change_1h": (-100, 100, 0, 1 / 100),
+    "price_change_15m": (-100, 100, 0, 1 / 100),
+    "price_change_5m": (-100, 100, 0, 1 / 100),
+    # Range/position: already 0-1 or percentage
+    "high_low_range": (0, 100, 0, 1 / 100),
+    "price_position": (0, 1, 0, 1),
+    # Volume: log scale for quote volume (in millions), clip multiplier
+    "volume_quote_24h": (0, 10000, 0, 1 / 10),
+    "volume_multiplier": (0, 20, 0, 1 / 20),
+    "volume_change_1h": (0, 500, 0, 1 / 500),
+    # Momentum (trend_state already -1, 0, 1)
+    "velocity": (-5, 5, 0, 1 / 5),
+    "acceleration": (-2, 2, 0, 1 / 2),
+    # Technical: rsi centered, mtf_alignment 0-4 (divergence_type already -1, 0, 1)
+    "rsi_1h": (0, 100, 50, 1 / 50),
+    "mtf_alignment": (-np.inf, np.inf, 0, 1 / 4),
+    # Funding: rate already in % (signal and direction_match already -1, 0, 1)
+    "funding_rate": (-1, 1, 0, 1),
+    # OI (signal and alignment already -1, 0, 1)
+    "oi_change_percent": (-50, 50, 0, 1 / 50),
+    # Pattern
+    "pattern_type": (-np.inf, np.inf, 0, 1 / 8),
+    "pattern_confidence": (-np.inf, np.inf, 0, 1 / 100),
+    "distance_from_level": (0, 10, 0, 1 / 10),
+    # Smart Signal
+    "smart_confidence": (-np.inf, np.inf, 0, 1 / 100),
+    "component_count": (-np.inf, np.inf, 0, 1 / 6),
+    "entry_type": (-np.inf, np.inf, 0, 1 / 3),
+    "risk_level": (-np.inf, np.inf, 0, 1 / 2),
+    # Entry timing
+    "atr_percent": (0, 10, 0, 1 / 10),
+    "vwap_distance": (-10, 10, 0, 1 / 10),
+    "risk_reward_ratio": (0, 10, 0, 1 / 10),
+    # Whale/Correlation
+    "whale_activity": (0, 100, 0, 1 / 100),
+    "btc_correlation": (-1, 1, 0, 1),
+    "btc_outperformance": (-50, 50, 0, 1 / 50),
+    # Direction already -1 or 1
+}
+_LO, _HI, _OFFSET, _SCALE = (
+    np.array(column, dtype=np.float32)
+    for column in zip(*(
+        _MANUAL_SCALING.get(name, (-np.inf, np.inf, 0, 1)) for name in FEATURE_NAMES
+    ))
+)
+_LOG_COL = FEATURE_NAMES.index("volume_quote_24h")
 
 
 class FeatureNormalizer:
@@ -14,19 +94,44 @@ class FeatureNormalizer:
         self.scaler = RobustScaler()  # Robust to outliers (common in trading data)
         self.is_fitted = False
         self.scaler_path = MODEL_DIR / "feature_scaler.joblib"
+        # Fitted scaler parameters as float32 vectors, so transform skips sklearn
+        self._center = None
+        self._scale = None
 
     def fit(self, features: np.ndarray) -> "FeatureNormalizer":
         """Fit the scaler on training data"""
         self.scaler.fit(features)
+        self._extract_scaling()
         self.is_fitted = True
         return self
 
-    def transform(self, features: np.ndarray) -> np.ndarray:
-        """Transform features using fitted scaler"""
+    def transform(self, features: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Transform features using fitted scaler, optionally into a preallocated out"""
+        # Models consume float32; converting here is a no-op for the request paths
+        features = np.asarray(features, dtype=np.float32)
+
         if not self.is_fitted:
             # If not fitted, return features as-is (will be scaled 0-1 manually)
             return self._manual_scale(features)
-        return self.scaler.transform(features)
+
+        # Same arithmetic as RobustScaler.transform without its per-call validation
+        if out is None:
+            out = np.empty(features.shape, dtype=np.float32)
+        if NUMBA_AVAILABLE and features.ndim == 2 and features.flags.c_contiguous:
+            robust_scale_rows(features, out, self._center, self._scale)
+            return out
+
+        np.subtract(features, self._center, out=out)
+        out /= self._scale
+        return out
+
+    def _extract_scaling(self) -> None:
+        """Cache the scaler's center and scale (identity where disabled) as float32"""
+        n_features = self.scaler.n_features_in_
+        center = self.scaler.center_ if self.scaler.with_centering else None
+        scale = self.scaler.scale_ if self.scaler.with_scaling else None
+        self._center = np.asarray(center if center is not None else np.zeros(n_features), dtype=np.float32)
+        self._scale = np.asarray(scale if scale is not None else np.ones(n_features), dtype=np.float32)
 
     def fit_transform(self, features: np.ndarray) -> np.ndarray:
         """Fit and transform in one step"""
@@ -35,63 +140,16 @@ class FeatureNormalizer:
 
     def _manual_scale(self, features: np.ndarray) -> np.ndarray:
         """Manual scaling when scaler is not fitted"""
-        # Apply reasonable bounds for each feature type
-        scaled = features.copy()
-
-        # Price changes: clip to [-100, 100], scale to [-1, 1]
-        for i in [0, 1, 2, 3]:  # price_change_*
-            scaled[:, i] = np.clip(scaled[:, i], -100, 100) / 100
-
-        # Range/position: already 0-1 or percentage
-        scaled[:, 4] = np.clip(scaled[:, 4], 0, 100) / 100  # high_low_range
-        scaled[:, 5] = np.clip(scaled[:, 5], 0, 1)  # price_position
-
-        # Volume: log scale for quote volume, clip multiplier
-        scaled[:, 6] = np.log1p(np.clip(scaled[:, 6], 0, 10000)) / 10  # volume_quote_24h (in millions)
-        scaled[:, 7] = np.clip(scaled[:, 7], 0, 20) / 20  # volume_multiplier
-        scaled[:, 8] = np.clip(scaled[:, 8], 0, 500) / 500  # volume_change_1h
-
-        # Momentum: velocity and acceleration
-        scaled[:, 9] = np.clip(scaled[:, 9], -5, 5) / 5  # velocity
-        scaled[:, 10] = np.clip(scaled[:, 10], -2, 2) / 2  # acceleration
-        # trend_state already -1, 0, 1
-
-        # Technical
-        scaled[:, 12] = (np.clip(scaled[:, 12], 0, 100) - 50) / 50  # rsi_1h centered
-        scaled[:, 13] = scaled[:, 13] / 4  # mtf_alignment (0-4)
-        # divergence_type already -1, 0, 1
-
-        # Funding
-        scaled[:, 15] = np.clip(scaled[:, 15], -1, 1)  # funding_rate (already in %)
-        # funding_signal and direction_match already -1, 0, 1
-
-        # OI
-        scaled[:, 18] = np.clip(scaled[:, 18], -50, 50) / 50  # oi_change_percent
-        # oi_signal and alignment already -1, 0, 1
-
-        # Pattern
-        scaled[:, 21] = scaled[:, 21] / 8  # pattern_type (0-8)
-        scaled[:, 22] = scaled[:, 22] / 100  # pattern_confidence
-        scaled[:, 23] = np.clip(scaled[:, 23], 0, 10) / 10  # distance_from_level
-
-        # Smart Signal
-        scaled[:, 24] = scaled[:, 24] / 100  # smart_confidence
-        scaled[:, 25] = scaled[:, 25] / 6  # component_count
-        scaled[:, 26] = scaled[:, 26] / 3  # entry_type
-        scaled[:, 27] = scaled[:, 27] / 2  # risk_level
-
-        # Entry timing
-        scaled[:, 28] = np.clip(scaled[:, 28], 0, 10) / 10  # atr_percent
-        scaled[:, 29] = np.clip(scaled[:, 29], -10, 10) / 10  # vwap_distance
-        scaled[:, 30] = np.clip(scaled[:, 30], 0, 10) / 10  # risk_reward_ratio
-
-        # Whale/Correlation
-        scaled[:, 31] = np.clip(scaled[:, 31], 0, 100) / 100  # whale_activity
-        scaled[:, 32] = np.clip(scaled[:, 32], -1, 1)  # btc_correlation
-        scaled[:, 33] = np.clip(scaled[:, 33], -50, 50) / 50  # btc_outperformance
-
-        # Direction already -1 or 1
-
+        if NUMBA_AVAILABLE and features.dtype == np.float32 and features.flags.c_contiguous:
+            scaled = np.empty_like(features)
+            normalize_rows(features, scaled, _LO, _HI, _OFFSET, _SCALE, _LOG_COL)
+            return scaled
+
+        # One clip / shift / scale pass over all columns using the bounds table
+        scaled = np.clip(features, _LO, _HI)
+        scaled -= _OFFSET
+        scaled[:, _LOG_COL] = np.log1p(scaled[:, _LOG_COL])
+        scaled *= _SCALE
         return scaled
 
     def save(self, path: Path = None) -> None:
@@ -105,6 +163,7 @@ class FeatureNormalizer:
         load_path = path or self.scaler_path
         if load_path.exists():
             self.scaler = joblib.load(load_path)
+            self._extract_scaling()
             self.is_fitted = True
             return True
         return False
@@ -112,40 +171,24 @@ class FeatureNormalizer:
     @staticmethod
     def features_dict_to_array(features_dict: Dict[str, Any]) -> np.ndarray:
         """Convert features dictionary to numpy array in correct order"""
-        return np.array([
-            features_dict.get("price_change_24h", 0),
-            features_dict.get("price_change_1h", 0),
-            features_dict.get("price_change_15m", 0),
-            features_dict.get("price_change_5m", 0),
-            features_dict.get("high_low_range", 0),
-            features_dict.get("price_position", 0.5),
-            features_dict.get("volume_quote_24h", 0),
-            features_dict.get("volume_multiplier", 1),
-            features_dict.get("volume_change_1h", 0),
-            features_dict.get("velocity", 0),
-            features_dict.get("acceleration", 0),
-            features_dict.get("trend_state", 0),
-            features_dict.get("rsi_1h", 50),
-            features_dict.get("mtf_alignment", 0),
-            features_dict.get("divergence_type", 0),
-            features_dict.get("funding_rate", 0),
-            features_dict.get("funding_signal", 0),
-            features_dict.get("funding_direction_match", 0),
-            features_dict.get("oi_change_percent", 0),
-            features_dict.get("oi_signal", 0),
-            features_dict.get("oi_price_alignment", 0),
-            features_dict.get("pattern_type", 0),
-            features_dict.get("pattern_confidence", 0),
-            features_dict.get("distance_from_level", 0),
-            features_dict.get("smart_confidence", 0),
-            features_dict.get("component_count", 0),
-            features_dict.get("entry_type", 0),
-            features_dict.get("risk_level", 1),
-            features_dict.get("atr_percent", 0),
-            features_dict.get("vwap_distance", 0),
-            features_dict.get("risk_reward_ratio", 1.5),
-            features_dict.get("whale_activity", 0),
-            features_dict.get("btc_correlation", 0),
-            features_dict.get("btc_outperformance", 0),
-            features_dict.get("direction", 1),
-        ]).reshape(1, -1)
+        try:
+            values = _get_all_features(features_dict)
+        except KeyError:
+            values = tuple(features_dict.get(name, default) for name, default in _GETTERS)
+        return _convert_tuple(values)
+
+    @staticmethod
+    def features_tuple_to_array(values: tuple) -> np.ndarray:
+        """Convert a complete tuple of feature values (in FEATURE_NAMES order) to an array"""
+        return _convert_tuple(values)
+
+    @staticmethod
+    def features_list_to_matrix(features_dicts: List[Dict[str, Any]]) -> np.ndarray:
+        """Convert a list of feature dictionaries to a (n_samples, n_features) float32 matrix"""
+        n = len(features_dicts)
+        matrix = np.empty((n, N_FEATURES), dtype=np.float32)
+        for col, (name, default) in enumerate(_GETTERS):
+            matrix[:, col] = np.fromiter(
+                (d.get(name, default) for d in features_dicts), dtype=np.float32, count=n
+            )
+        return matrix
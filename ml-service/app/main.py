@@ -1,11 +1,18 @@
+import asyncio
+import logging
 import time
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
 from .api.routes import router as api_router
 from .api.schemas import HealthResponse
-from .api.routes import classifier
-from .config import SERVER_HOST, SERVER_PORT
+from .api.routes import classifier, batcher, warmup_pool, CPU_POOL
+from .models.signal_classifier import ModelBusyError, TrainingDataError
+from .config import SERVER_HOST, SERVER_PORT, SERVER_WORKERS, MODEL_POLL_SECONDS
+
+logger = logging.getLogger(__name__)
 
 # Track startup time for uptime calculation
 START_TIME = time.time()
@@ -17,6 +24,46 @@ app = FastAPI(
     version="1.0.0",
 )
 
+
+class UnhandledErrorMiddleware:
+    """
+    Log unexpected errors once, off the event loop, and return a 500.
+
+    A FastAPI Exception handler runs inside Starlette's ServerErrorMiddleware,
+    which re-raises after responding, so the server logged every error twice.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_tracked(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_tracked)
+        except Exception as exc:
+            if response_started:
+                raise
+            await run_in_threadpool(
+                logger.error, "Unhandled error on %s", scope["path"], exc_info=exc
+            )
+            response = JSONResponse(status_code=500, content={"detail": str(exc)})
+            await response(scope, receive, send)
+
+
+# Inside CORS, so 500s carry the CORS headers too
+app.add_middleware(UnhandledErrorMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -30,6 +77,18 @@ app.add_middleware(
 app.include_router(api_router, prefix="/api/v1", tags=["ML API"])
 
 
+@app.exception_handler(TrainingDataError)
+async def training_data_error_handler(request: Request, exc: TrainingDataError):
+    """Bad training input (missing columns, too few samples, unparseable file) -> 400"""
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+@app.exception_handler(ModelBusyError)
+async def model_busy_handler(request: Request, exc: ModelBusyError):
+    """Train or reload while another one is running in this worker -> 409"""
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
+
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
@@ -62,6 +121,20 @@ async def root():
     }
 
 
+async def watch_saved_model():
+    """Reload when another worker process trains or reloads a model"""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(MODEL_POLL_SECONDS)
+        if classifier.saved_model_changed():
+            try:
+                loaded = await loop.run_in_executor(CPU_POOL, classifier.load)
+            except ModelBusyError:
+                continue  # this worker is training; retry on the next poll
+            if loaded:
+                await warmup_pool()
+
+
 @app.on_event("startup")
 async def startup_event():
     """Load model on startup"""
@@ -73,15 +146,30 @@ async def startup_event():
         print(f"Model loaded: {classifier.model_version}")
         print(f"Training samples: {classifier.training_samples}")
         print(f"Validation AUC: {classifier.validation_auc:.4f}")
+
+        await warmup_pool()
+        print("Model warmed up")
     else:
         print("No pre-trained model found.")
         print("Train a model using POST /api/v1/train")
 
+    if SERVER_WORKERS > 1:
+        app.state.model_watcher = asyncio.create_task(watch_saved_model())
+
     print("=" * 50)
     print(f"Server running at http://{SERVER_HOST}:{SERVER_PORT}")
     print("=" * 50)
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers"""
+    watcher = getattr(app.state, "model_watcher", None)
+    if watcher is not None:
+        watcher.cancel()
+    await batcher.close()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host=SERVER_HOST, port=SERVER_PORT)
@@ -0,0 +1,234 @@
+import ctypes
+import hashlib
+import os
+import platform
+import re
+import shutil
+import subprocess
+import tempfile
+import numpy as np
+from pathlib import Path
+from typing import Optional, Tuple
+
+from ..config import MODEL_DIR, FEATURE_NAMES
+
+try:
+    import tl2cgen
+    import treelite
+
+    KERNEL_AVAILABLE = shutil.which("gcc") is not None
+except ImportError:  # needs treelite for code generation and gcc to build it
+    KERNEL_AVAILABLE = False
+
+
+N_FEATURES = len(FEATURE_NAMES)
+
+# Built for the host CPU, so the library is only reused on the machine that compiled it
+COMPILE_OPTIONS = ["-O3", "-march=native", "-fPIC"]
+
+# Functions and tables every generated predictor exports; renamed per model
+_GENERATED_SYMBOLS = [
+    "predict", "postprocess", "quantize", "is_categorical",
+    "get_num_target", "get_num_class", "get_num_feature",
+    "get_threshold_type", "get_leaf_output_type",
+]
+
+_ENSEMBLE_SOURCE = """
+#include <math.h>
+#include <stddef.h>
+
+#define N_FEATURES {n_features}
+#define XGB_WEIGHT {xgb_weight!r}
+#define LGBM_WEIGHT {lgbm_weight!r}
+
+union XgbEntry {{ int missing; {xgb_threshold} fvalue; int qvalue; }};
+union LgbmEntry {{ int missing; {lgbm_threshold} fvalue; int qvalue; }};
+
+void xgb_predict(union XgbEntry* data, int pred_margin, {xgb_leaf}* result);
+void lgbm_predict(union LgbmEntry* data, int pred_margin, {lgbm_leaf}* result);
+
+/* out holds (win_probability, xgboost_prob, lightgbm_prob) per row */
+void predict_ensemble(const float* features, size_t n_rows, float* out) {{
+  union XgbEntry xgb_row[N_FEATURES];
+  union LgbmEntry lgbm_row[N_FEATURES];
+
+  for (size_t r = 0; r < n_rows; ++r) {{
+    const float* x = features + r * N_FEATURES;
+    for (int j = 0; j < N_FEATURES; ++j) {{
+      if (isnan(x[j])) {{
+        xgb_row[j].missing = -1;
+        lgbm_row[j].missing = -1;
+      }} else {{
+        xgb_row[j].fvalue = x[j];
+        lgbm_row[j].fvalue = x[j];
+      }}
+    }}
+
+    {xgb_leaf} xgb_prob = 0;
+    {lgbm_leaf} lgbm_prob = 0;
+    xgb_predict(xgb_row, 0, &xgb_prob);
+    lgbm_predict(lgbm_row, 0, &lgbm_prob);
+
+    out[3 * r] = (float)(XGB_WEIGHT * xgb_prob + LGBM_WEIGHT * lgbm_prob);
+    out[3 * r + 1] = (float)xgb_prob;
+    out[3 * r + 2] = (float)lgbm_prob;
+  }}
+}}
+"""
+
+
+def host_fingerprint() -> str:
+    """Identifies the CPU the kernel was built for (-march=native isn't portable)"""
+    try:
+        cpuinfo = Path("/proc/cpuinfo").read_text()
+        flags = re.search(r"^flags\s*:(.*)$", cpuinfo, re.MULTILINE)
+        model = re.search(r"^model name\s*:(.*)$", cpuinfo, re.MULTILINE)
+        key = f"{model.group(1) if model else ''}|{flags.group(1) if flags else ''}"
+    except OSError:
+        key = platform.processor()
+    return hashlib.sha1(f"{platform.machine()}|{key}".encode()).hexdigest()
+
+
+def kernel_path(xgb_model, lgbm_model, xgb_weight: float, lgbm_weight: float, model_version: Optional[str]) -> Path:
+    """
+    Library path unique to these boosters, weights and host.
+
+    ctypes never dlclose()s and dlopen() returns the already-mapped library for a
+    file name it has seen, so a rebuilt kernel must never reuse an old name.
+    """
+    digest = hashlib.sha1()
+    digest.update(bytes(xgb_model.get_booster().save_raw("ubj")))
+    digest.update(lgbm_model.model_to_string().encode())
+    digest.update(repr((float(xgb_weight), float(lgbm_weight))).encode())
+    digest.update(host_fingerprint().encode())
+    return MODEL_DIR / f"ensemble_kernel-{model_version}-{digest.hexdigest()[:16]}.so"
+
+
+def remove_stale_kernels(keep: Path) -> None:
+    """Delete libraries built for other models; processes that mapped one keep their copy"""
+    for stale in MODEL_DIR.glob("ensemble_kernel*"):
+        if stale != keep:
+            stale.unlink(missing_ok=True)
+
+
+def _predictor_types(header: str) -> Tuple[str, str]:
+    """(threshold type, leaf output type) declared in a generated header.h"""
+    threshold = re.search(r"union Entry \{[^}]*?(\w+) fvalue;", header, re.DOTALL).group(1)
+    leaf = re.search(r"void predict\(union Entry\* data, int pred_margin, (\w+)\* result\)", header).group(1)
+    return threshold, leaf
+
+
+def _generate_predictor(model, dirpath: Path, prefix: str) -> Tuple[list, str, str]:
+    """Emit one model's C source and compile it to objects with prefixed symbols"""
+    # quantize=1 maps each feature to its index among the model's own split thresholds
+    # and compares ints. Bins from a data sketch wouldn't line up with those splits.
+    tl2cgen.generate_c_code(model, dirpath=str(dirpath), params={"quantize": 1})
+    threshold, leaf = _predictor_types((dirpath / "header.h").read_text())
+
+    renames = [f"-D{name}={prefix}_{name}" for name in _GENERATED_SYMBOLS]
+    objects = []
+    for source in sorted(dirpath.glob("*.c")):
+        obj = source.with_suffix(".o")
+        subprocess.run(
+            ["gcc", *COMPILE_OPTIONS, *renames, "-c", str(source), "-o", str(obj)],
+            check=True,
+        )
+        objects.append(str(obj))
+    return objects, threshold, leaf
+
+
+def compile_kernel(
+    xgb_model,
+    lgbm_model,
+    xgb_weight: float,
+    lgbm_weight: float,
+    path: Path,
+    probe: Optional[np.ndarray] = None,
+) -> bool:
+    """
+    Generate and build one shared library that scores the whole ensemble.
+
+    Both boosters are emitted as C decision chains by TL2cgen, the ensemble
+    weights are baked in as constants, and everything is compiled for this host.
+    The library is checked against the native predictors on a probe batch of
+    normalized features before it is published at path (see kernel_path).
+    """
+    if not KERNEL_AVAILABLE:
+        return False
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            xgb_objects, xgb_threshold, xgb_leaf = _generate_predictor(
+                treelite.frontend.from_xgboost(xgb_model.get_booster()), tmp / "xgb", "xgb"
+            )
+            lgbm_objects, lgbm_threshold, lgbm_leaf = _generate_predictor(
+                treelite.frontend.from_lightgbm(lgbm_model), tmp / "lgbm", "lgbm"
+            )
+
+            ensemble_source = tmp / "ensemble.c"
+            ensemble_source.write_text(_ENSEMBLE_SOURCE.format(
+                n_features=N_FEATURES,
+                xgb_weight=float(xgb_weight),
+                lgbm_weight=float(lgbm_weight),
+                xgb_threshold=xgb_threshold,
+                xgb_leaf=xgb_leaf,
+                lgbm_threshold=lgbm_threshold,
+                lgbm_leaf=lgbm_leaf,
+            ))
+
+            # Link next to the model and rename into place once checked, so no
+            # process dlopen()s a half-written library
+            build_path = path.with_name(path.name + ".tmp")
+            subprocess.run(
+                ["gcc", *COMPILE_OPTIONS, "-shared", str(ensemble_source), *xgb_objects, *lgbm_objects,
+                 "-o", str(build_path), "-lm"],
+                check=True,
+            )
+
+        if probe is None:
+            probe = np.random.default_rng(0).normal(size=(256, N_FEATURES))
+        probe = np.ascontiguousarray(probe, dtype=np.float32)
+
+        kernel_proba = EnsembleKernel(build_path).predict(probe)[0]
+        native_proba = (
+            xgb_weight * xgb_model.predict_proba(probe)[:, 1]
+            + lgbm_weight * lgbm_model.predict(probe)
+        )
+        max_diff = float(np.max(np.abs(kernel_proba - native_proba)))
+        if max_diff > 1e-4:
+            print(f"[EnsembleKernel] Build rejected, max deviation {max_diff:.2e}")
+            build_path.unlink(missing_ok=True)
+            return False
+
+        os.replace(build_path, path)
+        remove_stale_kernels(keep=path)
+        print(f"[EnsembleKernel] Ensemble kernel compiled to {path}")
+        return True
+
+    except Exception as e:
+        print(f"[EnsembleKernel] Error compiling ensemble kernel: {e}")
+        return False
+
+
+class EnsembleKernel:
+    """Compiled XGBoost + LightGBM ensemble called directly through ctypes"""
+
+    def __init__(self, path: Path):
+        self.lib = ctypes.CDLL(str(path))
+        self._predict = self.lib.predict_ensemble
+        self._predict.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p]
+        self._predict.restype = None
+
+    def predict(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Score normalized features in a single native call.
+
+        Returns:
+            Tuple of (win_probabilities, xgb_probabilities, lgbm_probabilities)
+        """
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        n_rows = features.shape[0]
+        out = np.empty((n_rows, 3), dtype=np.float32)
+        self._predict(features.ctypes.data, n_rows, out.ctypes.data)
+        return out[:, 0], out[:, 1], out[:, 2]
@@ -0,0 +1,104 @@
+import numpy as np
+from pathlib import Path
+from typing import Callable, Iterable, List, Tuple
+
+import xgboost as xgb
+import lightgbm as lgb
+
+from ..features.normalizer import FeatureNormalizer
+
+# Rows sampled from the shards to fit the RobustScaler (median/IQR need no more)
+SCALER_SAMPLE_ROWS = 200_000
+
+# Rows normalized per step when rewriting a spilled shard in place
+NORMALIZE_BATCH_ROWS = 65_536
+
+
+def spill_shards(
+    shard_paths: Iterable[Path],
+    load_shard: Callable[[Path], Tuple[np.ndarray, np.ndarray]],
+    normalizer: FeatureNormalizer,
+    workdir: Path,
+) -> Tuple[List[Path], List[np.ndarray]]:
+    """
+    Write each shard's normalized float32 features to its own .npy file.
+
+    Shards are loaded one at a time. Raw rows are spilled first while a strided
+    sample is kept to fit the normalizer, then each file is normalized in place.
+
+    Returns:
+        Tuple of (spilled feature paths, per-shard int32 labels)
+    """
+    spilled, labels, samples = [], [], []
+    for i, shard_path in enumerate(shard_paths):
+        features, shard_labels = load_shard(shard_path)
+        path = workdir / f"shard_{i:05d}.npy"
+        np.save(path, np.ascontiguousarray(features, dtype=np.float32))
+        spilled.append(path)
+        labels.append(np.asarray(shard_labels, dtype=np.int32))
+        samples.append(features[:: max(1, len(features) // SCALER_SAMPLE_ROWS)].copy())
+        del features
+
+    if not spilled:
+        raise ValueError("No training shards given")
+
+    sample = np.concatenate(samples)
+    stride = max(1, len(sample) // SCALER_SAMPLE_ROWS)
+    normalizer.fit(sample[::stride])
+    del samples, sample
+
+    for path in spilled:
+        rows = np.load(path, mmap_mode="r+")
+        for start in range(0, len(rows), NORMALIZE_BATCH_ROWS):
+            batch = rows[start:start + NORMALIZE_BATCH_ROWS]
+            normalizer.transform(batch, out=batch)
+        rows.flush()
+        del rows
+
+    return spilled, labels
+
+
+class ShardIter(xgb.DataIter):
+    """Feeds spilled shards to XGBoost's external-memory DMatrix one at a time"""
+
+    def __init__(self, paths: List[Path], labels: List[np.ndarray], cache_prefix: str):
+        self._paths = paths
+        self._labels = labels
+        self._it = 0
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data: Callable) -> bool:
+        if self._it == len(self._paths):
+            return False
+        input_data(data=np.load(self._paths[self._it], mmap_mode="r"), label=self._labels[self._it])
+        self._it += 1
+        return True
+
+    def reset(self) -> None:
+        self._it = 0
+
+
+class ShardSequence(lgb.Sequence):
+    """Memory-mapped spilled shard, read by LightGBM in batches while binning"""
+
+    batch_size = NORMALIZE_BATCH_ROWS
+
+    def __init__(self, path: Path):
+        self._rows = np.load(path, mmap_mode="r")
+
+    def __getitem__(self, idx) -> np.ndarray:
+        # LightGBM samples Sequences as float64; only the requested batch is upcast
+        return np.asarray(self._rows[idx], dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+def external_xgb_matrix(paths: List[Path], labels: List[np.ndarray], cache_dir: Path) -> xgb.DMatrix:
+    """Quantile-binned XGBoost matrix whose pages are cached on disk under cache_dir"""
+    return xgb.ExtMemQuantileDMatrix(ShardIter(paths, labels, cache_prefix=str(cache_dir / "xgb")))
+
+
+def external_lgbm_dataset(paths: List[Path], labels: List[np.ndarray]) -> lgb.Dataset:
+    """LightGBM dataset constructed batch by batch from the spilled shards"""
+    return lgb.Dataset([ShardSequence(path) for path in paths], label=np.concatenate(labels))
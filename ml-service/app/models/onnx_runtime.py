@@ -0,0 +1,213 @@
+import threading
+import numpy as np
+from pathlib import Path
+from typing import Optional, Tuple
+
+from ..config import MODEL_DIR, FEATURE_NAMES
+
+try:
+    import onnx
+    import onnxruntime as ort
+    from onnx import TensorProto, compose, helper
+    from onnxmltools import convert_lightgbm, convert_xgboost
+    from onnxmltools.convert.common.data_types import FloatTensorType
+
+    ONNX_AVAILABLE = True
+except ImportError:  # onnx extras are optional; the native predictors still work
+    ONNX_AVAILABLE = False
+
+
+ONNX_MODEL_PATH = MODEL_DIR / "ensemble.onnx"
+INPUT_NAME = "input"
+OUTPUT_NAMES = ["win_probability", "xgboost_prob", "lightgbm_prob"]
+TARGET_OPSET = 15
+N_FEATURES = len(FEATURE_NAMES)
+
+
+def _positive_class_column(prefix: str) -> Tuple[list, str]:
+    """Nodes selecting P(WIN) from a converted model's (N, 2) probabilities"""
+    index_name = f"{prefix}win_index"
+    output_name = f"{prefix}win_prob"
+    index = helper.make_tensor(index_name, TensorProto.INT64, [], [1])
+    nodes = [
+        helper.make_node("Constant", [], [index_name], value=index),
+        helper.make_node(
+            "Gather", [f"{prefix}probabilities", index_name], [output_name], axis=1
+        ),
+    ]
+    return nodes, output_name
+
+
+def _merge_opsets(*models) -> list:
+    """Union of opset imports, keeping the highest version per domain"""
+    versions = {}
+    for model in models:
+        for opset in model.opset_import:
+            versions[opset.domain] = max(versions.get(opset.domain, 0), opset.version)
+    return [helper.make_opsetid(domain, version) for domain, version in versions.items()]
+
+
+def build_ensemble_graph(xgb_model, lgbm_model, xgb_weight: float, lgbm_weight: float):
+    """
+    Convert both boosters and fuse them into one ONNX graph.
+
+    The graph takes a float32 (N, n_features) "input" of normalized features
+    and returns the weighted ensemble probability alongside each model's
+    own probability, all shaped (N,).
+    """
+    initial_types = [(INPUT_NAME, FloatTensorType([None, N_FEATURES]))]
+
+    xgb_onnx = convert_xgboost(
+        xgb_model, initial_types=initial_types, target_opset=TARGET_OPSET
+    )
+    lgbm_onnx = convert_lightgbm(
+        lgbm_model, initial_types=initial_types, zipmap=False, target_opset=TARGET_OPSET
+    )
+
+    # Prefix everything except the shared input so both subgraphs can coexist
+    xgb_onnx = compose.add_prefix(xgb_onnx, "xgb_", rename_inputs=False)
+    lgbm_onnx = compose.add_prefix(lgbm_onnx, "lgbm_", rename_inputs=False)
+
+    xgb_nodes, xgb_prob = _positive_class_column("xgb_")
+    lgbm_nodes, lgbm_prob = _positive_class_column("lgbm_")
+
+    weights = [
+        helper.make_tensor("xgb_weight", TensorProto.FLOAT, [], [xgb_weight]),
+        helper.make_tensor("lgbm_weight", TensorProto.FLOAT, [], [lgbm_weight]),
+    ]
+    ensemble_nodes = [
+        helper.make_node("Mul", [xgb_prob, "xgb_weight"], ["xgb_weighted"]),
+        helper.make_node("Mul", [lgbm_prob, "lgbm_weight"], ["lgbm_weighted"]),
+        helper.make_node("Add", ["xgb_weighted", "lgbm_weighted"], ["win_probability"]),
+        helper.make_node("Identity", [xgb_prob], ["xgboost_prob"]),
+        helper.make_node("Identity", [lgbm_prob], ["lightgbm_prob"]),
+    ]
+
+    graph = helper.make_graph(
+        nodes=(
+            list(xgb_onnx.graph.node)
+            + list(lgbm_onnx.graph.node)
+            + xgb_nodes
+            + lgbm_nodes
+            + ensemble_nodes
+        ),
+        name="signal_ensemble",
+        inputs=[helper.make_tensor_value_info(INPUT_NAME, TensorProto.FLOAT, [None, N_FEATURES])],
+        outputs=[
+            helper.make_tensor_value_info(name, TensorProto.FLOAT, [None])
+            for name in OUTPUT_NAMES
+        ],
+        initializer=(
+            list(xgb_onnx.graph.initializer)
+            + list(lgbm_onnx.graph.initializer)
+            + weights
+        ),
+    )
+
+    # Keep the converters' IR version; onnx's default can be newer than onnxruntime supports
+    model = helper.make_model(
+        graph,
+        opset_imports=_merge_opsets(xgb_onnx, lgbm_onnx),
+        ir_version=max(xgb_onnx.ir_version, lgbm_onnx.ir_version),
+    )
+    onnx.checker.check_model(model)
+    return model
+
+
+def export_ensemble(
+    xgb_model,
+    lgbm_model,
+    xgb_weight: float,
+    lgbm_weight: float,
+    model_version: Optional[str] = None,
+    path: Path = ONNX_MODEL_PATH,
+    probe: Optional[np.ndarray] = None,
+) -> bool:
+    """
+    Export the ensemble to a single ONNX file.
+
+    The graph is checked against the native predictors on a probe batch of
+    normalized features before being written. onnxmltools releases have
+    disagreed with XGBoost 2.x about how base_score and split conditions are
+    stored, so a graph that drifts is discarded rather than served.
+    """
+    if not ONNX_AVAILABLE:
+        return False
+
+    try:
+        model = build_ensemble_graph(xgb_model, lgbm_model, xgb_weight, lgbm_weight)
+        if model_version:
+            helper.set_model_props(model, {"model_version": model_version})
+
+        if probe is None:
+            probe = np.random.default_rng(0).normal(size=(256, N_FEATURES))
+        probe = np.ascontiguousarray(probe, dtype=np.float32)
+
+        session = ort.InferenceSession(
+            model.SerializeToString(), providers=["CPUExecutionProvider"]
+        )
+        onnx_proba = session.run(["win_probability"], {INPUT_NAME: probe})[0]
+        native_proba = (
+            xgb_weight * xgb_model.predict_proba(probe)[:, 1]
+            + lgbm_weight * lgbm_model.predict(probe)
+        )
+        max_diff = float(np.max(np.abs(onnx_proba - native_proba)))
+        if max_diff > 1e-4:
+            print(f"[OnnxEnsemble] Export rejected, max deviation {max_diff:.2e}")
+            return False
+
+        onnx.save(model, str(path))
+        print(f"[OnnxEnsemble] Ensemble exported to {path}")
+        return True
+
+    except Exception as e:
+        print(f"[OnnxEnsemble] Error exporting ensemble: {e}")
+        return False
+
+
+class OnnxEnsemble:
+    """ONNX Runtime session serving the fused XGBoost + LightGBM graph"""
+
+    def __init__(self, path: Path = ONNX_MODEL_PATH):
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = 1
+        options.inter_op_num_threads = 1
+
+        self.session = ort.InferenceSession(
+            str(path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.model_version = self.session.get_modelmeta().custom_metadata_map.get(
+            "model_version"
+        )
+        # One (1, n_features) input buffer and binding per thread
+        self._local = threading.local()
+
+    def _single_row_binding(self):
+        local = self._local
+        if not hasattr(local, "binding"):
+            local.buffer = np.zeros((1, N_FEATURES), dtype=np.float32)
+            local.binding = self.session.io_binding()
+            local.binding.bind_cpu_input(INPUT_NAME, local.buffer)
+            for name in OUTPUT_NAMES:
+                local.binding.bind_output(name)
+        return local.buffer, local.binding
+
+    def predict(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Run the ensemble on normalized features.
+
+        Returns:
+            Tuple of (win_probabilities, xgb_probabilities, lgbm_probabilities)
+        """
+        if features.shape[0] == 1:
+            buffer, binding = self._single_row_binding()
+            buffer[...] = features
+            self.session.run_with_iobinding(binding)
+            win_proba, xgb_proba, lgbm_proba = binding.copy_outputs_to_cpu()
+        else:
+            batch = np.ascontiguousarray(features, dtype=np.float32)
+            win_proba, xgb_proba, lgbm_proba = self.session.run(
+                OUTPUT_NAMES, {INPUT_NAME: batch}
+            )
+        return win_proba, xgb_proba, lgbm_proba
@@ -1,10 +1,24 @@
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from datetime import datetime
+from functools import lru_cache, wraps
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import tempfile
 import joblib
+from joblib import Parallel, delayed
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows dev boxes run a single worker anyway
+    fcntl = None
+
+import xgboost as xgb
 from xgboost import XGBClassifier
+import lightgbm as lgb
 from lightgbm import LGBMClassifier
 from sklearn.model_selection import TimeSeriesSplit
 from sklearn.metrics import roc_auc_score, accuracy_score, precision_score, recall_score
@@ -17,7 +31,175 @@ from ..config import (
     FEATURE_NAMES,
     QUALITY_TIERS,
 )
-from ..features.normalizer import FeatureNormalizer
+from ..features.normalizer import N_FEATURES, FeatureNormalizer
+from .onnx_runtime import ONNX_AVAILABLE, ONNX_MODEL_PATH, OnnxEnsemble, export_ensemble
+from .treelite_runtime import (
+    TREELITE_AVAILABLE,
+    TreeliteEnsemble,
+    compile_ensemble,
+    compiled_version,
+)
+from .ensemble_kernel import KERNEL_AVAILABLE, EnsembleKernel, compile_kernel, kernel_path
+from .external_memory import external_lgbm_dataset, external_xgb_matrix, spill_shards
+
+
+class TrainingDataError(ValueError):
+    """Training input the caller has to fix (missing columns, too few samples, ...)"""
+
+
+class ModelBusyError(RuntimeError):
+    """A training run or reload is already replacing the model in this process"""
+
+
+# Native model files; the .joblib pickles are still read if no native files exist
+XGB_MODEL_PATH = MODEL_DIR / "xgboost_model.ubj"
+LGBM_MODEL_PATH = MODEL_DIR / "lightgbm_model.txt"
+LEGACY_XGB_PATH = MODEL_DIR / "xgboost_model.joblib"
+LEGACY_LGBM_PATH = MODEL_DIR / "lightgbm_model.joblib"
+METADATA_PATH = MODEL_DIR / "model_metadata.joblib"
+
+# Held while a worker builds or loads a compiled runtime, so concurrent uvicorn
+# workers build each artifact once and then all map the same file
+RUNTIME_LOCK_PATH = MODEL_DIR / "runtime.lock"
+
+# Held exclusively while saving the model files and shared while reading them, so
+# no worker loads a half-written set or interleaves its save with another's
+MODEL_LOCK_PATH = MODEL_DIR / "model.lock"
+
+
+@contextmanager
+def _file_lock(path: Path, shared: bool = False):
+    """Cross-process flock on path (no-op where fcntl is unavailable)"""
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _runtime_lock():
+    """Cross-process lock around compiled runtime builds"""
+    return _file_lock(RUNTIME_LOCK_PATH)
+
+
+def _exclusive(method):
+    """Let one train/load run at a time per process; others get ModelBusyError"""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self._update_lock.acquire(blocking=False):
+            raise ModelBusyError("A training run or model reload is already in progress")
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._update_lock.release()
+
+    return wrapper
+
+
+# Tier labels indexed by np.searchsorted(TIER_THRESHOLDS, p, side="right")
+TIER_LABELS = np.array(["FILTER", "LOW", "MEDIUM", "HIGH"], dtype=object)
+TIER_THRESHOLDS = np.array([QUALITY_TIERS["LOW"], QUALITY_TIERS["MEDIUM"], QUALITY_TIERS["HIGH"]])
+
+
+# Walk-forward validation folds
+CV_SPLITS = 5
+
+
+def _xgb_train_params(params: Dict) -> Tuple[Dict, int]:
+    """XGBClassifier-style params as (xgb.train params, num_boost_round)"""
+    params = dict(params)
+    num_boost_round = params.pop("n_estimators")
+    params["nthread"] = params.pop("n_jobs")
+    params["seed"] = params.pop("random_state")
+    return params, num_boost_round
+
+
+def _lgbm_train_params(params: Dict) -> Tuple[Dict, int]:
+    """LGBMClassifier-style params as (lgb.train params, num_boost_round)"""
+    params = dict(params)
+    num_boost_round = params.pop("n_estimators")
+    params["num_threads"] = params.pop("n_jobs")
+    params["seed"] = params.pop("random_state")
+    return params, num_boost_round
+
+
+def _as_slice(idx: np.ndarray) -> Union[slice, np.ndarray]:
+    """Contiguous fold indices as a slice, so indexing yields a view instead of a copy"""
+    if len(idx) and idx[-1] - idx[0] + 1 == len(idx) and np.all(np.diff(idx) == 1):
+        return slice(int(idx[0]), int(idx[-1]) + 1)
+    return idx
+
+
+def _fit_fold(
+    features: np.ndarray,
+    labels: np.ndarray,
+    train_idx: np.ndarray,
+    val_idx: np.ndarray,
+    xgb_params: Dict,
+    lgbm_params: Dict,
+    xgb_weight: float,
+    lgbm_weight: float,
+    keep_models: bool = False,
+) -> Tuple[Tuple[float, float, float, float], Optional[Tuple[xgb.Booster, lgb.Booster]]]:
+    """
+    Fit both models on one CV fold (module level so loky workers can run it).
+
+    Returns:
+        Tuple of ((xgb_auc, lgbm_auc, ensemble_auc, accuracy), models), where
+        models is (xgb_booster, lgbm_booster) if keep_models else None
+    """
+    train_idx, val_idx = _as_slice(train_idx), _as_slice(val_idx)
+    X_train, X_val = features[train_idx], features[val_idx]
+    y_train, y_val = labels[train_idx], labels[val_idx]
+
+    # Train XGBoost
+    params, num_boost_round = _xgb_train_params(xgb_params)
+    # Sketch the fold's own rows: cut points from the full data would see the
+    # validation window, and metrics would depend on how folds are scheduled
+    dtrain = xgb.QuantileDMatrix(X_train, label=y_train)
+    xgb_booster = xgb.train(params, dtrain, num_boost_round=num_boost_round)
+
+    # Train LightGBM
+    lgbm = LGBMClassifier(**lgbm_params)
+    lgbm.fit(
+        X_train,
+        y_train,
+        eval_set=[(X_val, y_val)],
+    )
+
+    # Predictions
+    xgb_proba = xgb_booster.inplace_predict(X_val)
+    lgbm_proba = lgbm.predict_proba(X_val)[:, 1]
+    ensemble_proba = xgb_weight * xgb_proba + lgbm_weight * lgbm_proba
+
+    # Calculate metrics
+    metrics = (
+        roc_auc_score(y_val, xgb_proba),
+        roc_auc_score(y_val, lgbm_proba),
+        roc_auc_score(y_val, ensemble_proba),
+        accuracy_score(y_val, (ensemble_proba >= 0.5).astype(int)),
+    )
+    return metrics, (xgb_booster, lgbm.booster_) if keep_models else None
+
+
+def _confidence(win_probas: np.ndarray) -> np.ndarray:
+    """abs(p - 0.5) * 200 for a batch, computed in a single output buffer"""
+    confidences = np.subtract(win_probas, 0.5)
+    np.abs(confidences, out=confidences)
+    confidences *= 200
+    return confidences
+
+
+def _as_xgb_classifier(booster: xgb.Booster, params: Dict) -> XGBClassifier:
+    """Load a trained booster into the sklearn wrapper the rest of the service uses"""
+    model = XGBClassifier(**params)
+    model.load_model(bytearray(booster.save_raw("ubj")))
+    return model
 
 
 class SignalClassifier:
@@ -25,7 +207,12 @@ class SignalClassifier:
 
     def __init__(self):
         self.xgb_model: Optional[XGBClassifier] = None
-        self.lgbm_model: Optional[LGBMClassifier] = None
+        # LightGBM is kept as its Booster; the sklearn wrapper is only used to fit
+        self.lgbm_model: Optional[lgb.Booster] = None
+        # Raw XGBoost booster handle for the native predict path
+        self.xgb_booster = None
+        # Compiled ensemble (ONNX, Treelite or fused kernel) used for inference when available
+        self.runtime: Optional[Union[OnnxEnsemble, TreeliteEnsemble, EnsembleKernel]] = None
         self.normalizer = FeatureNormalizer()
 
         self.model_version: Optional[str] = None
@@ -39,6 +226,25 @@ class SignalClassifier:
         self.xgb_weight = MODEL_CONFIG["xgboost_weight"]
         self.lgbm_weight = MODEL_CONFIG["lightgbm_weight"]
 
+        # Side thread for XGBoost on large native batches while LightGBM runs on the
+        # caller; both release the GIL in predict, so this only pays off with spare cores
+        self._booster_pool: Optional[ThreadPoolExecutor] = None
+        if (os.cpu_count() or 1) > 1:
+            self._booster_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="xgb-predict")
+        self._parallel_min_rows = MODEL_CONFIG["parallel_booster_min_rows"]
+        self._early_exit_margin: Optional[float] = MODEL_CONFIG["ensemble_early_exit_margin"]
+
+        # Single-row results keyed by the raw float32 feature bytes; cleared on train/load
+        self.cache_decimals: Optional[int] = MODEL_CONFIG["prediction_cache_decimals"]
+        self._predict_cached = lru_cache(maxsize=MODEL_CONFIG["prediction_cache_size"])(
+            self._predict_row
+        )
+
+        # mtime of the metadata file this process last loaded or saved
+        self._saved_stamp: Optional[int] = None
+        # Held by train/load for their whole run (see _exclusive)
+        self._update_lock = threading.Lock()
+
         # Try to load existing model
         self.load()
 
@@ -46,6 +252,7 @@ class SignalClassifier:
     def is_loaded(self) -> bool:
         return self.xgb_model is not None and self.lgbm_model is not None
 
+    @_exclusive
     def train(
         self,
         features: np.ndarray,
@@ -66,116 +273,242 @@ class SignalClassifier:
         n_samples = len(labels)
 
         if n_samples < MODEL_CONFIG["min_training_samples"]:
-            raise ValueError(
+            raise TrainingDataError(
                 f"Insufficient training data: {n_samples} samples, "
                 f"minimum required: {MODEL_CONFIG['min_training_samples']}"
             )
 
-        # Order by timestamp if available
-        if timestamps is not None:
-            sort_idx = np.argsort(timestamps)
-            features = features[sort_idx]
-            labels = labels[sort_idx]
+        # Train on the same float32 values the predict path sees
+        features = np.asarray(features, dtype=np.float32)
 
-        # Normalize features
-        features_normalized = self.normalizer.fit_transform(features)
+        # Order by timestamp if available (exports are usually already in order)
+        if timestamps is not None:
+            timestamps = np.asarray(timestamps)
+            if np.issubdtype(timestamps.dtype, np.datetime64):
+                timestamps = timestamps.astype("datetime64[ns]").view(np.int64)
+            if np.any(timestamps[1:] < timestamps[:-1]):
+                # Stable sort: timsort on int64 keys is fast on nearly ordered data,
+                # and signals sharing a timestamp keep their input order
+                sort_idx = np.argsort(timestamps, kind="stable")
+                features = np.take(features, sort_idx, axis=0)
+                labels = np.take(labels, sort_idx)
+
+        # Fit a new scaler; the serving one is replaced only once training succeeds
+        normalizer = FeatureNormalizer()
+        features_normalized = normalizer.fit_transform(features)
 
         # Calculate class weights for imbalanced data
-        n_positive = np.sum(labels == 1)
-        n_negative = np.sum(labels == 0)
+        counts = np.bincount(labels.astype(np.int64, copy=False), minlength=2)
+        n_negative, n_positive = int(counts[0]), int(counts[1])
         scale_pos_weight = n_negative / max(n_positive, 1)
 
         # Update XGBoost params with calculated weight
         xgb_params = XGBOOST_PARAMS.copy()
         xgb_params["scale_pos_weight"] = scale_pos_weight
 
-        # Time-series cross-validation (walk-forward)
-        tscv = TimeSeriesSplit(n_splits=5)
-
-        xgb_aucs = []
-        lgbm_aucs = []
-        ensemble_aucs = []
-        accuracies = []
-
-        for train_idx, val_idx in tscv.split(features_normalized):
-            X_train, X_val = features_normalized[train_idx], features_normalized[val_idx]
-            y_train, y_val = labels[train_idx], labels[val_idx]
-
-            # Train XGBoost
-            xgb = XGBClassifier(**xgb_params)
-            xgb.fit(
-                X_train,
-                y_train,
-                eval_set=[(X_val, y_val)],
-                verbose=False,
+        # Time-series cross-validation (walk-forward); folds are independent, so fit
+        # them in parallel and split the cores between the concurrent boosters
+        tscv = TimeSeriesSplit(n_splits=CV_SPLITS)
+        n_cores = os.cpu_count() or 1
+        n_parallel = min(CV_SPLITS, n_cores)
+        fold_threads = max(1, n_cores // n_parallel)
+
+        # Either refit on all data after CV, or serve the last fold's models
+        # (trained on all but the final validation window) and skip that pass
+        refit = MODEL_CONFIG["refit_on_full_data"]
+        splits = list(tscv.split(features_normalized))
+
+        fold_results = Parallel(n_jobs=n_parallel, backend="loky")(
+            delayed(_fit_fold)(
+                features_normalized,
+                labels,
+                train_idx,
+                val_idx,
+                {**xgb_params, "n_jobs": fold_threads},
+                {**LIGHTGBM_PARAMS, "n_jobs": fold_threads},
+                self.xgb_weight,
+                self.lgbm_weight,
+                keep_models=not refit and fold == len(splits) - 1,
             )
+            for fold, (train_idx, val_idx) in enumerate(splits)
+        )
+        xgb_aucs, lgbm_aucs, ensemble_aucs, accuracies = zip(
+            *(metrics for metrics, _ in fold_results)
+        )
+
+        if refit:
+            # Train final models on all data
+            params, num_boost_round = _xgb_train_params(xgb_params)
+            dtrain_full = xgb.QuantileDMatrix(features_normalized, label=labels)
+            xgb_booster = xgb.train(params, dtrain_full, num_boost_round=num_boost_round)
 
-            # Train LightGBM
             lgbm = LGBMClassifier(**LIGHTGBM_PARAMS)
-            lgbm.fit(
-                X_train,
-                y_train,
-                eval_set=[(X_val, y_val)],
-            )
+            lgbm.fit(features_normalized, labels)
+            lgbm_booster = lgbm.booster_
+        else:
+            xgb_booster, lgbm_booster = fold_results[-1][1]
+
+        self._finish_training(
+            normalizer,
+            xgb_booster,
+            lgbm_booster,
+            xgb_params,
+            n_samples,
+            validation_auc=float(np.mean(ensemble_aucs)),
+            validation_accuracy=float(np.mean(accuracies)),
+            probe=features_normalized[-256:],
+        )
 
-            # Predictions
-            xgb_proba = xgb.predict_proba(X_val)[:, 1]
-            lgbm_proba = lgbm.predict_proba(X_val)[:, 1]
+        return self._training_result(
+            float(np.mean(xgb_aucs)), float(np.mean(lgbm_aucs)), n_positive, n_negative
+        )
+
+    @_exclusive
+    def train_external(
+        self,
+        shard_paths: List[Path],
+        load_shard: Callable[[Path], Tuple[np.ndarray, np.ndarray]],
+    ) -> Dict:
+        """
+        Train from chronologically ordered shards that need not fit in memory together.
+
+        Shards are normalized and spilled to disk, then read back in batches by
+        XGBoost's external-memory matrix and LightGBM Sequence datasets. The last
+        shard is the validation window (one walk-forward split instead of CV).
+
+        Args:
+            shard_paths: Shards in time order
+            load_shard: Returns (float32 features, 0/1 labels) for one shard
+
+        Returns:
+            Training metrics dictionary
+        """
+        shard_paths = list(shard_paths)
+        if len(shard_paths) < 2:
+            raise TrainingDataError("External-memory training needs at least two shards")
+
+        with tempfile.TemporaryDirectory(prefix="train-cache-", dir=MODEL_DIR) as workdir:
+            workdir = Path(workdir)
+            # Fit a new scaler; the serving one is replaced only once training succeeds
+            normalizer = FeatureNormalizer()
+            paths, labels = spill_shards(shard_paths, load_shard, normalizer, workdir)
+
+            n_samples = sum(len(shard_labels) for shard_labels in labels)
+            if n_samples < MODEL_CONFIG["min_training_samples"]:
+                raise TrainingDataError(
+                    f"Insufficient training data: {n_samples} samples, "
+                    f"minimum required: {MODEL_CONFIG['min_training_samples']}"
+                )
+
+            counts = sum(np.bincount(shard_labels, minlength=2) for shard_labels in labels)
+            n_negative, n_positive = int(counts[0]), int(counts[1])
+
+            xgb_params = XGBOOST_PARAMS.copy()
+            xgb_params["scale_pos_weight"] = n_negative / max(n_positive, 1)
+            params, num_boost_round = _xgb_train_params(xgb_params)
+            lgbm_params, lgbm_rounds = _lgbm_train_params(LIGHTGBM_PARAMS)
+
+            def fit(n_shards: int) -> Tuple[xgb.Booster, lgb.Booster]:
+                dtrain = external_xgb_matrix(paths[:n_shards], labels[:n_shards], workdir)
+                xgb_booster = xgb.train(params, dtrain, num_boost_round=num_boost_round)
+                del dtrain
+                dataset = external_lgbm_dataset(paths[:n_shards], labels[:n_shards])
+                lgbm_booster = lgb.train(lgbm_params, dataset, num_boost_round=lgbm_rounds)
+                return xgb_booster, lgbm_booster
+
+            # Validate on the last shard, then refit on everything (or serve as is)
+            xgb_booster, lgbm_booster = fit(len(paths) - 1)
+            X_val, y_val = np.load(paths[-1]), labels[-1]
+            xgb_proba = xgb_booster.inplace_predict(X_val)
+            lgbm_proba = lgbm_booster.predict(X_val)
             ensemble_proba = self.xgb_weight * xgb_proba + self.lgbm_weight * lgbm_proba
 
-            # Calculate metrics
-            xgb_aucs.append(roc_auc_score(y_val, xgb_proba))
-            lgbm_aucs.append(roc_auc_score(y_val, lgbm_proba))
-            ensemble_aucs.append(roc_auc_score(y_val, ensemble_proba))
-            accuracies.append(accuracy_score(y_val, (ensemble_proba >= 0.5).astype(int)))
+            if MODEL_CONFIG["refit_on_full_data"]:
+                xgb_booster, lgbm_booster = fit(len(paths))
+
+            self._finish_training(
+                normalizer,
+                xgb_booster,
+                lgbm_booster,
+                xgb_params,
+                n_samples,
+                validation_auc=float(roc_auc_score(y_val, ensemble_proba)),
+                validation_accuracy=float(accuracy_score(y_val, (ensemble_proba >= 0.5).astype(int))),
+                probe=X_val[-256:],
+            )
 
-        # Train final models on all data
-        self.xgb_model = XGBClassifier(**xgb_params)
-        self.xgb_model.fit(features_normalized, labels, verbose=False)
+        return self._training_result(
+            float(roc_auc_score(y_val, xgb_proba)),
+            float(roc_auc_score(y_val, lgbm_proba)),
+            n_positive,
+            n_negative,
+        )
 
-        self.lgbm_model = LGBMClassifier(**LIGHTGBM_PARAMS)
-        self.lgbm_model.fit(features_normalized, labels)
+    def _finish_training(
+        self,
+        normalizer: FeatureNormalizer,
+        xgb_booster: xgb.Booster,
+        lgbm_booster: lgb.Booster,
+        xgb_params: Dict,
+        n_samples: int,
+        validation_auc: float,
+        validation_accuracy: float,
+        probe: np.ndarray,
+    ) -> None:
+        """Install the new scaler and boosters, record metadata, save and load the runtime"""
+        xgb_model = _as_xgb_classifier(xgb_booster, xgb_params)
+        inference_booster = self._pin_inference_threads(xgb_model)
+
+        # Requests keep being served while this runs: drop the old compiled runtime
+        # (rebuilt below), then swap the scaler and boosters in back to back
+        self.runtime = None
+        self.normalizer = normalizer
+        self.xgb_model = xgb_model
+        self.xgb_booster = inference_booster
+        self.lgbm_model = lgbm_booster
 
         # Calculate feature importance (average of both models)
         xgb_importance = self.xgb_model.feature_importances_
-        lgbm_importance = self.lgbm_model.feature_importances_
+        lgbm_importance = self.lgbm_model.feature_importance()
         avg_importance = (xgb_importance * self.xgb_weight + lgbm_importance * self.lgbm_weight)
 
         # Normalize to sum to 1
         avg_importance = avg_importance / avg_importance.sum()
 
+        # Most important first; stable so ties (often unused features) keep input order
+        order = np.argsort(-avg_importance, kind="stable")
         self.feature_importance = {
-            name: float(imp) for name, imp in zip(FEATURE_NAMES, avg_importance)
+            FEATURE_NAMES[i]: float(avg_importance[i]) for i in order.tolist()
         }
 
-        # Sort by importance
-        self.feature_importance = dict(
-            sorted(self.feature_importance.items(), key=lambda x: x[1], reverse=True)
-        )
-
         # Store training metadata
         self.model_version = datetime.now().strftime("v1.%Y%m%d%H%M%S")
         self.training_date = datetime.now()
         self.training_samples = n_samples
-        self.validation_auc = float(np.mean(ensemble_aucs))
-        self.validation_accuracy = float(np.mean(accuracies))
+        self.validation_auc = validation_auc
+        self.validation_accuracy = validation_accuracy
+
+        self._predict_cached.cache_clear()
 
         # Save models
         self.save()
+        self._load_runtime(probe=probe)
 
+    def _training_result(self, xgb_auc: float, lgbm_auc: float, n_positive: int, n_negative: int) -> Dict:
+        """Metrics dictionary returned by the train methods"""
         return {
             "status": "success",
             "model_version": self.model_version,
             "training_samples": self.training_samples,
             "validation_auc": self.validation_auc,
             "validation_accuracy": self.validation_accuracy,
-            "xgb_auc": float(np.mean(xgb_aucs)),
-            "lgbm_auc": float(np.mean(lgbm_aucs)),
+            "xgb_auc": xgb_auc,
+            "lgbm_auc": lgbm_auc,
             "feature_importance": self.feature_importance,
             "class_distribution": {
-                "wins": int(n_positive),
-                "losses": int(n_negative),
-                "win_rate": float(n_positive / n_samples),
+                "wins": n_positive,
+                "losses": n_negative,
+                "win_rate": float(n_positive / self.training_samples),
             },
         }
 
@@ -197,14 +530,11 @@ class SignalClassifier:
             features = features.reshape(1, -1)
 
         # Normalize
-        features_normalized = self.normalizer.transform(features)
+        features_normalized = self.normalizer.transform(self._round_features(features))
 
-        # Get predictions from both models
-        xgb_proba = self.xgb_model.predict_proba(features_normalized)[0, 1]
-        lgbm_proba = self.lgbm_model.predict_proba(features_normalized)[0, 1]
-
-        # Ensemble prediction
-        win_probability = self.xgb_weight * xgb_proba + self.lgbm_weight * lgbm_proba
+        # Ensemble prediction (compiled runtime when loaded, else both boosters)
+        win_probas, _, _ = self._ensemble_proba(features_normalized)
+        win_probability = float(win_probas[0])
 
         # Determine quality tier
         quality_tier = self._get_quality_tier(win_probability)
@@ -230,45 +560,53 @@ class SignalClassifier:
         features = np.vstack(features_list)
 
         # Normalize
-        features_normalized = self.normalizer.transform(features)
+        features_normalized = self.normalizer.transform(self._round_features(features))
 
-        # Get predictions
-        xgb_probas = self.xgb_model.predict_proba(features_normalized)[:, 1]
-        lgbm_probas = self.lgbm_model.predict_proba(features_normalized)[:, 1]
+        # Ensemble predictions (compiled runtime when loaded, else both boosters)
+        win_probabilities, _, _ = self._ensemble_proba(features_normalized)
 
-        # Ensemble predictions
-        win_probabilities = self.xgb_weight * xgb_probas + self.lgbm_weight * lgbm_probas
+        # Classify the whole batch at once, then hand back plain Python tuples
+        quality_tiers = TIER_LABELS[
+            np.searchsorted(TIER_THRESHOLDS, win_probabilities, side="right")
+        ]
+        confidences = _confidence(win_probabilities)
+        should_filter = win_probabilities < QUALITY_TIERS["LOW"]
 
-        results = []
-        for win_prob in win_probabilities:
-            quality_tier = self._get_quality_tier(win_prob)
-            confidence = abs(win_prob - 0.5) * 200
-            should_filter = win_prob < QUALITY_TIERS["LOW"]
-            results.append((float(win_prob), quality_tier, float(confidence), should_filter))
-            self.predictions_made += 1
+        self.predictions_made += len(win_probabilities)
 
-        return results
+        return list(zip(
+            win_probabilities.tolist(),
+            quality_tiers.tolist(),
+            confidences.tolist(),
+            should_filter.tolist(),
+        ))
 
     def predict_detailed(self, features: np.ndarray) -> Dict:
         """Predict with detailed breakdown"""
         if not self.is_loaded:
             raise RuntimeError("Model not loaded. Train or load a model first.")
 
-        if features.ndim == 1:
-            features = features.reshape(1, -1)
+        features = self._round_features(np.ascontiguousarray(features, dtype=np.float32))
+        result = self._predict_cached(features.tobytes())
+
+        self.predictions_made += 1
+
+        return dict(result)
 
+    def _predict_row(self, features_bytes: bytes) -> Dict:
+        """Uncached single-row prediction behind predict_detailed"""
+        features = np.frombuffer(features_bytes, dtype=np.float32).reshape(1, -1)
         features_normalized = self.normalizer.transform(features)
 
-        xgb_proba = float(self.xgb_model.predict_proba(features_normalized)[0, 1])
-        lgbm_proba = float(self.lgbm_model.predict_proba(features_normalized)[0, 1])
-        win_probability = self.xgb_weight * xgb_proba + self.lgbm_weight * lgbm_proba
+        win_probas, xgb_probas, lgbm_probas = self._ensemble_proba(features_normalized)
+        win_probability = float(win_probas[0])
+        xgb_proba = float(xgb_probas[0])
+        lgbm_proba = float(lgbm_probas[0])
 
         quality_tier = self._get_quality_tier(win_probability)
         confidence = abs(win_probability - 0.5) * 200
         should_filter = win_probability < QUALITY_TIERS["LOW"]
 
-        self.predictions_made += 1
-
         return {
             "win_probability": win_probability,
             "quality_tier": quality_tier,
@@ -279,6 +617,117 @@ class SignalClassifier:
             "model_version": self.model_version,
         }
 
+    def predict_detailed_batch(self, features: np.ndarray) -> Dict:
+        """
+        Predict with detailed breakdown for a whole feature matrix in one call.
+
+        Args:
+            features: Shape (n_samples, n_features)
+
+        Returns:
+            Dictionary of per-sample arrays, in input row order
+        """
+        if not self.is_loaded:
+            raise RuntimeError("Model not loaded. Train or load a model first.")
+
+        features_normalized = self.normalizer.transform(self._round_features(features))
+
+        win_probas, xgb_probas, lgbm_probas = self._ensemble_proba(features_normalized)
+
+        tier_indices = np.searchsorted(TIER_THRESHOLDS, win_probas, side="right").astype(np.uint8)
+        confidences = _confidence(win_probas)
+        should_filter = win_probas < QUALITY_TIERS["LOW"]
+
+        self.predictions_made += len(win_probas)
+
+        return {
+            "win_probability": win_probas,
+            "quality_tier": TIER_LABELS[tier_indices],
+            "tier_index": tier_indices,
+            "confidence": confidences,
+            "should_filter": should_filter,
+            "xgboost_prob": xgb_probas,
+            "lightgbm_prob": lgbm_probas,
+            "model_version": self.model_version,
+        }
+
+    def warmup(self, batch_sizes: Tuple[int, ...] = (1, 8, 64), rounds: int = 3) -> None:
+        """
+        Run throwaway predictions so the first real request doesn't pay one-time
+        setup costs (runtime allocations, thread-local bindings, cold caches).
+
+        Bypasses the prediction cache and the predictions_made counter.
+        """
+        if not self.is_loaded:
+            return
+
+        for _ in range(rounds):
+            for n_rows in batch_sizes:
+                features = np.zeros((n_rows, N_FEATURES), dtype=np.float32)
+                # Requests arrive both writable (batcher buffers) and read-only
+                # (cached rows, np.frombuffer); Numba compiles each separately
+                readonly = features.copy()
+                readonly.flags.writeable = False
+                for batch in (features, readonly):
+                    self._ensemble_proba(self.normalizer.transform(batch))
+
+    def _round_features(self, features: np.ndarray) -> np.ndarray:
+        """
+        Round raw features to prediction_cache_decimals when configured.
+
+        Every predict path scores the rounded row, so a signal gets the same
+        probability whether it is cached, scored alone or batched.
+        """
+        if self.cache_decimals is None:
+            return features
+        return np.round(np.asarray(features, dtype=np.float32), self.cache_decimals)
+
+    def _ensemble_proba(
+        self, features_normalized: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (ensemble, xgboost, lightgbm) win probabilities for normalized features"""
+        assert features_normalized.dtype == np.float32, features_normalized.dtype
+        if self.runtime is not None:
+            return self.runtime.predict(features_normalized)
+
+        xgb_probas, lgbm_probas = self._native_proba(features_normalized)
+        win_probas = self.xgb_weight * xgb_probas + self.lgbm_weight * lgbm_probas
+        return win_probas, xgb_probas, lgbm_probas
+
+    def _native_proba(self, features_normalized: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(xgboost, lightgbm) win probabilities straight from the boosters"""
+        features_normalized = np.ascontiguousarray(features_normalized, dtype=np.float32)
+        # inplace_predict skips DMatrix construction; binary:logistic yields P(WIN)
+        if self._early_exit_margin is not None:
+            return self._early_exit_proba(features_normalized)
+
+        if self._booster_pool is not None and features_normalized.shape[0] >= self._parallel_min_rows:
+            xgb_future = self._booster_pool.submit(self.xgb_booster.inplace_predict, features_normalized)
+            lgbm_probas = self.lgbm_model.predict(features_normalized, num_threads=1)
+            return xgb_future.result(), lgbm_probas
+
+        xgb_probas = self.xgb_booster.inplace_predict(features_normalized)
+        lgbm_probas = self.lgbm_model.predict(features_normalized, num_threads=1)
+        return xgb_probas, lgbm_probas
+
+    def _early_exit_proba(self, features_normalized: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score XGBoost first and LightGBM only on rows XGBoost isn't confident about.
+
+        Skipped rows report LightGBM's probability as XGBoost's, so their ensemble
+        probability is XGBoost's alone.
+        """
+        xgb_probas = self.xgb_booster.inplace_predict(features_normalized)
+        uncertain = np.abs(xgb_probas - 0.5) <= self._early_exit_margin
+
+        # LightGBM predicts float64; keep that dtype so filled-in rows stay exact
+        lgbm_probas = xgb_probas.astype(np.float64)
+        if uncertain.any():
+            lgbm_probas[uncertain] = self.lgbm_model.predict(
+                features_normalized[uncertain], num_threads=1
+            )
+        return xgb_probas, lgbm_probas
+
     def _get_quality_tier(self, win_probability: float) -> str:
         """Determine quality tier based on win probability"""
         if win_probability >= QUALITY_TIERS["HIGH"]:
@@ -295,18 +744,13 @@ class SignalClassifier:
         if not self.is_loaded:
             return
 
-        # Save XGBoost model
-        xgb_path = MODEL_DIR / "xgboost_model.joblib"
-        joblib.dump(self.xgb_model, xgb_path)
-
-        # Save LightGBM model
-        lgbm_path = MODEL_DIR / "lightgbm_model.joblib"
-        joblib.dump(self.lgbm_model, lgbm_path)
+        with _file_lock(MODEL_LOCK_PATH):
+            self._write_model_files()
 
-        # Save normalizer
-        self.normalizer.save()
+        print(f"[SignalClassifier] Models saved to {MODEL_DIR}")
 
-        # Save metadata
+    def _write_model_files(self) -> None:
+        """Write boosters, scaler and metadata (metadata last); caller holds the model lock"""
         metadata = {
             "model_version": self.model_version,
             "training_date": self.training_date.isoformat() if self.training_date else None,
@@ -317,47 +761,179 @@ class SignalClassifier:
             "xgb_weight": self.xgb_weight,
             "lgbm_weight": self.lgbm_weight,
         }
-        metadata_path = MODEL_DIR / "model_metadata.joblib"
-        joblib.dump(metadata, metadata_path)
 
-        print(f"[SignalClassifier] Models saved to {MODEL_DIR}")
+        # Save XGBoost model (native UBJSON)
+        self.xgb_model.save_model(XGB_MODEL_PATH)
+
+        # Save LightGBM model (native text format)
+        self.lgbm_model.save_model(LGBM_MODEL_PATH)
+
+        # Save normalizer
+        self.normalizer.save()
+
+        # Save metadata
+        joblib.dump(metadata, METADATA_PATH)
+        self._saved_stamp = self._metadata_stamp()
 
+    @_exclusive
     def load(self) -> bool:
         """Load models from disk"""
-        xgb_path = MODEL_DIR / "xgboost_model.joblib"
-        lgbm_path = MODEL_DIR / "lightgbm_model.joblib"
-        metadata_path = MODEL_DIR / "model_metadata.joblib"
+        try:
+            # Shared with other readers; waits out a save in progress in any worker
+            with _file_lock(MODEL_LOCK_PATH, shared=True):
+                stamp = self._metadata_stamp()
+
+                native = XGB_MODEL_PATH.exists() and LGBM_MODEL_PATH.exists()
+                legacy = LEGACY_XGB_PATH.exists() and LEGACY_LGBM_PATH.exists()
+                if not (native or legacy):
+                    print("[SignalClassifier] No saved models found")
+                    return False
+
+                # Read everything first; the serving model stays in place if any file is bad
+                if native:
+                    xgb_model = XGBClassifier()
+                    xgb_model.load_model(XGB_MODEL_PATH)
+                    lgbm_model = lgb.Booster(model_file=str(LGBM_MODEL_PATH))
+                else:
+                    # Pickled sklearn wrappers from before the switch to native formats
+                    xgb_model = joblib.load(LEGACY_XGB_PATH)
+                    lgbm_model = joblib.load(LEGACY_LGBM_PATH).booster_
+                normalizer = FeatureNormalizer()
+                normalizer.load()
+                metadata = joblib.load(METADATA_PATH) if METADATA_PATH.exists() else None
+
+            inference_booster = self._pin_inference_threads(xgb_model)
 
-        if not all(p.exists() for p in [xgb_path, lgbm_path]):
-            print("[SignalClassifier] No saved models found")
+        except Exception as e:
+            print(f"[SignalClassifier] Error loading models: {e}")
             return False
 
+        # As in _finish_training: drop the old compiled runtime, then swap the
+        # scaler and boosters in back to back
+        self.runtime = None
+        self.normalizer = normalizer
+        self.xgb_model = xgb_model
+        self.xgb_booster = inference_booster
+        self.lgbm_model = lgbm_model
+
+        if metadata is not None:
+            self.model_version = metadata.get("model_version")
+            training_date_str = metadata.get("training_date")
+            if training_date_str:
+                self.training_date = datetime.fromisoformat(training_date_str)
+            self.training_samples = metadata.get("training_samples", 0)
+            self.validation_auc = metadata.get("validation_auc", 0)
+            self.validation_accuracy = metadata.get("validation_accuracy", 0)
+            self.feature_importance = metadata.get("feature_importance", {})
+            self.xgb_weight = metadata.get("xgb_weight", MODEL_CONFIG["xgboost_weight"])
+            self.lgbm_weight = metadata.get("lgbm_weight", MODEL_CONFIG["lightgbm_weight"])
+
+        self._saved_stamp = stamp
+        print(f"[SignalClassifier] Models loaded: {self.model_version}")
+        if not native:
+            self._migrate_legacy()
+        self._load_runtime()
+        # Last, so no result from the previous model or runtime survives the swap
+        self._predict_cached.cache_clear()
+        return True
+
+    def _migrate_legacy(self) -> None:
+        """
+        Rewrite the legacy pickles in native formats so later loads skip unpickling.
+
+        The pickles hold booster bytes, not NumPy arrays, so mmap_mode can't share
+        them. Workers that start together all find only the pickles; the first to
+        take the lock migrates and the rest see its native files and keep them.
+        """
+        try:
+            with _file_lock(MODEL_LOCK_PATH):
+                if XGB_MODEL_PATH.exists() and LGBM_MODEL_PATH.exists():
+                    # Same model, written by another worker
+                    self._saved_stamp = self._metadata_stamp()
+                    return
+                self._write_model_files()
+            print(f"[SignalClassifier] Legacy models migrated to {MODEL_DIR}")
+        except Exception as e:
+            print(f"[SignalClassifier] Could not migrate legacy models: {e}")
+
+    @staticmethod
+    def _metadata_stamp() -> Optional[int]:
+        """Modification time of the saved metadata, which save() writes last"""
         try:
-            self.xgb_model = joblib.load(xgb_path)
-            self.lgbm_model = joblib.load(lgbm_path)
-            self.normalizer.load()
-
-            if metadata_path.exists():
-                metadata = joblib.load(metadata_path)
-                self.model_version = metadata.get("model_version")
-                training_date_str = metadata.get("training_date")
-                if training_date_str:
-                    self.training_date = datetime.fromisoformat(training_date_str)
-                self.training_samples = metadata.get("training_samples", 0)
-                self.validation_auc = metadata.get("validation_auc", 0)
-                self.validation_accuracy = metadata.get("validation_accuracy", 0)
-                self.feature_importance = metadata.get("feature_importance", {})
-                self.xgb_weight = metadata.get("xgb_weight", MODEL_CONFIG["xgboost_weight"])
-                self.lgbm_weight = metadata.get("lgbm_weight", MODEL_CONFIG["lightgbm_weight"])
-
-            print(f"[SignalClassifier] Models loaded: {self.model_version}")
-            return True
+            return METADATA_PATH.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def saved_model_changed(self) -> bool:
+        """Whether the model on disk differs from the one this process loaded or saved"""
+        return self._metadata_stamp() != self._saved_stamp
+
+    @staticmethod
+    def _pin_inference_threads(xgb_model: XGBClassifier) -> xgb.Booster:
+        """Predict single-threaded; concurrency comes from the API's CPU pool"""
+        xgb_model.set_params(n_jobs=1)
+        booster = xgb_model.get_booster()
+        booster.set_param({"nthread": 1})
+        # LightGBM takes num_threads per predict call (see _native_proba)
+        return booster
+
+    def _load_runtime(self, probe: Optional[np.ndarray] = None) -> None:
+        """Load the configured compiled ensemble, falling back to the native predictors"""
+        self.runtime = None
+        backend = MODEL_CONFIG["inference_backend"]
 
+        try:
+            with _runtime_lock():
+                if backend == "onnx" and ONNX_AVAILABLE:
+                    self.runtime = self._load_onnx(probe)
+                elif backend == "treelite" and TREELITE_AVAILABLE:
+                    self.runtime = self._load_treelite()
+                elif backend == "kernel" and KERNEL_AVAILABLE:
+                    self.runtime = self._load_kernel(probe)
         except Exception as e:
-            print(f"[SignalClassifier] Error loading models: {e}")
-            self.xgb_model = None
-            self.lgbm_model = None
-            return False
+            print(f"[SignalClassifier] {backend} runtime unavailable, using native predictors: {e}")
+            self.runtime = None
+
+    def _load_onnx(self, probe: Optional[np.ndarray] = None) -> Optional[OnnxEnsemble]:
+        """Load the fused ONNX ensemble, re-exporting it if missing or stale"""
+        if ONNX_MODEL_PATH.exists():
+            ensemble = OnnxEnsemble()
+            if ensemble.model_version == self.model_version:
+                return ensemble
+
+        exported = export_ensemble(
+            self.xgb_model,
+            self.lgbm_model,
+            self.xgb_weight,
+            self.lgbm_weight,
+            model_version=self.model_version,
+            probe=probe,
+        )
+        return OnnxEnsemble() if exported else None
+
+    def _load_treelite(self) -> Optional[TreeliteEnsemble]:
+        """Load the compiled Treelite libraries, recompiling them if missing or stale"""
+        if compiled_version() != self.model_version:
+            if not compile_ensemble(self.xgb_model, self.lgbm_model, self.model_version):
+                return None
+        return TreeliteEnsemble(self.xgb_weight, self.lgbm_weight)
+
+    def _load_kernel(self, probe: Optional[np.ndarray] = None) -> Optional[EnsembleKernel]:
+        """Load the fused ensemble kernel, building it if none exists for this model and host"""
+        path = kernel_path(
+            self.xgb_model, self.lgbm_model, self.xgb_weight, self.lgbm_weight, self.model_version
+        )
+        if not path.exists():
+            if not compile_kernel(
+                self.xgb_model,
+                self.lgbm_model,
+                self.xgb_weight,
+                self.lgbm_weight,
+                path,
+                probe=probe,
+            ):
+                return None
+        return EnsembleKernel(path)
 
     def get_stats(self) -> Dict:
         """Get model statistics"""
@@ -0,0 +1,92 @@
+import os
+import joblib
+import numpy as np
+from pathlib import Path
+from typing import Optional, Tuple
+
+from ..config import MODEL_DIR
+
+try:
+    import tl2cgen
+    import treelite
+
+    TREELITE_AVAILABLE = True
+except ImportError:  # treelite extras are optional; the native predictors still work
+    TREELITE_AVAILABLE = False
+
+
+XGB_LIB_PATH = MODEL_DIR / "xgboost_model.so"
+LGBM_LIB_PATH = MODEL_DIR / "lightgbm_model.so"
+LIB_METADATA_PATH = MODEL_DIR / "treelite_metadata.joblib"
+
+# Thresholds are compiled as integer bin indices ("quantize"), and tree
+# translation units are compiled in parallel
+COMPILE_PARAMS = {
+    "parallel_comp": os.cpu_count() or 1,
+    "quantize": 1,
+}
+COMPILE_OPTIONS = ["-O3"]
+
+
+def compile_ensemble(xgb_model, lgbm_model, model_version: Optional[str] = None) -> bool:
+    """Compile both boosters to shared libraries with Treelite / TL2cgen"""
+    if not TREELITE_AVAILABLE:
+        return False
+
+    try:
+        xgb_tree = treelite.frontend.from_xgboost(xgb_model.get_booster())
+        lgbm_tree = treelite.frontend.from_lightgbm(lgbm_model)
+
+        for model, libpath in [(xgb_tree, XGB_LIB_PATH), (lgbm_tree, LGBM_LIB_PATH)]:
+            tl2cgen.export_lib(
+                model,
+                toolchain="gcc",
+                libpath=str(libpath),
+                params=COMPILE_PARAMS,
+                options=COMPILE_OPTIONS,
+            )
+
+        joblib.dump({"model_version": model_version}, LIB_METADATA_PATH)
+        print(f"[TreeliteEnsemble] Ensemble compiled to {MODEL_DIR}")
+        return True
+
+    except Exception as e:
+        print(f"[TreeliteEnsemble] Error compiling ensemble: {e}")
+        return False
+
+
+def compiled_version() -> Optional[str]:
+    """Model version the compiled libraries were built from, if any"""
+    paths = [XGB_LIB_PATH, LGBM_LIB_PATH, LIB_METADATA_PATH]
+    if not all(p.exists() for p in paths):
+        return None
+    return joblib.load(LIB_METADATA_PATH).get("model_version")
+
+
+class TreeliteEnsemble:
+    """Compiled XGBoost + LightGBM predictors loaded from shared libraries"""
+
+    def __init__(
+        self,
+        xgb_weight: float,
+        lgbm_weight: float,
+        xgb_path: Path = XGB_LIB_PATH,
+        lgbm_path: Path = LGBM_LIB_PATH,
+    ):
+        self.xgb_predictor = tl2cgen.Predictor(str(xgb_path), nthread=1)
+        self.lgbm_predictor = tl2cgen.Predictor(str(lgbm_path), nthread=1)
+        self.xgb_weight = xgb_weight
+        self.lgbm_weight = lgbm_weight
+
+    def predict(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Run both compiled predictors on normalized features.
+
+        Returns:
+            Tuple of (win_probabilities, xgb_probabilities, lgbm_probabilities)
+        """
+        dmat = tl2cgen.DMatrix(np.ascontiguousarray(features, dtype=np.float32), dtype="float32")
+        xgb_probas = self.xgb_predictor.predict(dmat).reshape(-1)
+        lgbm_probas = self.lgbm_predictor.predict(dmat).reshape(-1)
+        win_probas = self.xgb_weight * xgb_probas + self.lgbm_weight * lgbm_probas
+        return win_probas, xgb_probas, lgbm_probas
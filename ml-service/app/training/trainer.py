@@ -2,10 +2,40 @@ import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
+from contextlib import contextmanager
 
-from ..models.signal_classifier import SignalClassifier
+from ..models.signal_classifier import SignalClassifier, TrainingDataError
 from ..config import FEATURE_NAMES, MODEL_CONFIG
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:  # fall back to pandas' parser
+    PYARROW_AVAILABLE = False
+
+# Rows parsed per chunk when streaming CSV uploads
+CSV_CHUNK_SIZE = 50_000
+
+# Accepted outcome values and their labels; anything else is an open signal
+# (a chunk with any text outcome parses 1/0 as the strings "1"/"0")
+OUTCOME_LABELS = {"WIN": 1, "LOSS": 0, 1: 1, 0: 0, "1": 1, "0": 0}
+
+
+@contextmanager
+def _training_input():
+    """Report failures while parsing or converting training data as bad input"""
+    try:
+        yield
+    except TrainingDataError:
+        raise
+    except FileNotFoundError as e:
+        raise TrainingDataError(f"Training file not found: {e.filename or e}") from e
+    except ValueError as e:  # parser errors, non-numeric features, bad encodings
+        raise TrainingDataError(f"Invalid training data: {e}") from e
+
 
 class Trainer:
     """Training pipeline for signal classifier"""
@@ -22,9 +52,128 @@ class Trainer:
         - All feature columns from FEATURE_NAMES
         - outcome: 'WIN' or 'LOSS' (or 1/0)
         """
-        df = pd.read_csv(csv_path)
+        with _training_input():
+            if PYARROW_AVAILABLE:
+                df = self._read_csv_arrow(csv_path)
+            else:
+                df = pd.read_csv(csv_path, dtype={col: np.float32 for col in FEATURE_NAMES})
+        return self._train_from_dataframe(df)
+
+    def _read_csv_arrow(self, csv_path: str) -> pd.DataFrame:
+        """Parse a CSV with Arrow's multithreaded reader, keeping only the training columns"""
+        table = pacsv.read_csv(
+            csv_path,
+            convert_options=pacsv.ConvertOptions(
+                column_types={col: pa.float32() for col in FEATURE_NAMES}
+            ),
+        )
+
+        # Missing columns are left for _train_from_dataframe to report
+        columns = [
+            col for col in FEATURE_NAMES + ["outcome", "timestamp"] if col in table.column_names
+        ]
+        table = table.select(columns)
+        # Hand Arrow's buffers over column by column instead of consolidating a copy
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    def train_from_csv_stream(self, source, chunksize: int = CSV_CHUNK_SIZE) -> Dict:
+        """
+        Train model from a CSV path or buffer, parsing it in chunks.
+
+        Feature columns are parsed straight to float32 and each chunk is cut
+        down to completed signals and the columns training needs, so the
+        full-width frame is never materialized.
+        """
+        with _training_input():
+            df = self._read_csv_chunked(source, chunksize)
+        return self._train_from_dataframe(df)
+
+    def _read_csv_chunked(self, source, chunksize: int) -> pd.DataFrame:
+        """Read only the training columns of completed signals, chunk by chunk"""
+        reader = pd.read_csv(
+            source,
+            chunksize=chunksize,
+            dtype={col: np.float32 for col in FEATURE_NAMES},
+        )
+
+        chunks = []
+        columns = None
+        for chunk in reader:
+            if columns is None:
+                missing_cols = [col for col in FEATURE_NAMES if col not in chunk.columns]
+                if missing_cols:
+                    raise TrainingDataError(f"Missing required feature columns: {missing_cols}")
+                if "outcome" not in chunk.columns:
+                    raise TrainingDataError("Missing 'outcome' column")
+                columns = FEATURE_NAMES + ["outcome"]
+                if "timestamp" in chunk.columns:
+                    columns.append("timestamp")
+
+            # Label each chunk on its own: its outcome dtype is inferred separately
+            # (1/0 in one chunk, WIN/LOSS in the next) and can't be mapped after concat
+            labels = chunk["outcome"].map(OUTCOME_LABELS)
+            completed = labels.notna()
+            chunk = chunk.loc[completed, columns].assign(
+                outcome=labels[completed].astype(np.int32)
+            )
+            chunks.append(chunk)
+
+        if not chunks:
+            raise TrainingDataError("CSV contains no rows")
+
+        return pd.concat(chunks, ignore_index=True)
+
+    def train_from_parquet(self, parquet_paths: List[str]) -> Dict:
+        """
+        Train model from parquet shards given in chronological order.
+
+        Shards use the CSV columns. With MODEL_CONFIG["external_memory"] they are
+        loaded one at a time and streamed through disk during training, so the
+        full history never has to fit in memory; otherwise they are concatenated.
+        """
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("Parquet training requires pyarrow")
+
+        if MODEL_CONFIG["external_memory"]:
+            return self.classifier.train_external(
+                [Path(path) for path in parquet_paths], self._load_parquet_shard
+            )
+
+        with _training_input():
+            df = pd.concat(
+                [self._read_parquet_columns(path) for path in parquet_paths], ignore_index=True
+            )
         return self._train_from_dataframe(df)
 
+    def _read_parquet_columns(self, path) -> pd.DataFrame:
+        """Read only the training columns of one parquet shard"""
+        available = pq.read_schema(path).names
+        missing_cols = [col for col in FEATURE_NAMES if col not in available]
+        if missing_cols:
+            raise TrainingDataError(f"Missing required feature columns in {path}: {missing_cols}")
+        if "outcome" not in available:
+            raise TrainingDataError(f"Missing 'outcome' column in {path}")
+
+        columns = FEATURE_NAMES + ["outcome"]
+        if "timestamp" in available:
+            columns.append("timestamp")
+        return pq.read_table(path, columns=columns).to_pandas(split_blocks=True, self_destruct=True)
+
+    def _load_parquet_shard(self, path) -> Tuple[np.ndarray, np.ndarray]:
+        """(float32 features, int32 labels) of the completed signals in one shard"""
+        with _training_input():
+            df = self._read_parquet_columns(path)
+            df = df[df["outcome"].isin(["WIN", "LOSS", 1, 0])]
+            if "timestamp" in df.columns and not df["timestamp"].is_monotonic_increasing:
+                df = df.sort_values("timestamp", kind="stable")
+
+            outcome = df["outcome"]
+            if not pd.api.types.is_numeric_dtype(outcome):
+                outcome = outcome.map({"WIN": 1, "LOSS": 0})
+
+            features = df[FEATURE_NAMES].to_numpy(dtype=np.float32, na_value=0.0)
+            return features, outcome.to_numpy(dtype=np.int32)
+
     def train_from_data(self, training_data: List[Dict]) -> Dict:
         """
         Train model from list of training data dictionaries.
@@ -35,19 +184,26 @@ class Trainer:
         - outcome: 1 (WIN) or 0 (LOSS)
         """
         if len(training_data) < MODEL_CONFIG["min_training_samples"]:
-            raise ValueError(
+            raise TrainingDataError(
                 f"Insufficient training data: {len(training_data)} samples, "
                 f"minimum required: {MODEL_CONFIG['min_training_samples']}"
             )
 
-        # Convert to arrays
-        features = np.array([d["features"] for d in training_data])
-        labels = np.array([d["outcome"] for d in training_data])
-
-        # Get timestamps if available
-        timestamps = None
-        if "timestamp" in training_data[0]:
-            timestamps = np.array([d["timestamp"] for d in training_data])
+        # Fill preallocated float32 / int32 arrays in one pass over the dicts
+        n = len(training_data)
+        features = np.empty((n, len(FEATURE_NAMES)), dtype=np.float32)
+        labels = np.empty(n, dtype=np.int32)
+        with _training_input():
+            for i, d in enumerate(training_data):
+                features[i] = d["features"]
+                labels[i] = d["outcome"]
+
+            # Get timestamps if available
+            timestamps = None
+            if "timestamp" in training_data[0]:
+                timestamps = np.fromiter(
+                    (d["timestamp"] for d in training_data), dtype=np.int64, count=n
+                )
 
         return self.classifier.train(features, labels, timestamps)
 
@@ -58,7 +214,7 @@ class Trainer:
         Each dict should have all feature columns plus 'outcome'.
         """
         if len(signal_features_list) < MODEL_CONFIG["min_training_samples"]:
-            raise ValueError(
+            raise TrainingDataError(
                 f"Insufficient training data: {len(signal_features_list)} samples, "
                 f"minimum required: {MODEL_CONFIG['min_training_samples']}"
             )
@@ -71,30 +227,28 @@ class Trainer:
         # Check required columns
         missing_cols = [col for col in FEATURE_NAMES if col not in df.columns]
         if missing_cols:
-            raise ValueError(f"Missing required feature columns: {missing_cols}")
+            raise TrainingDataError(f"Missing required feature columns: {missing_cols}")
 
         if "outcome" not in df.columns:
-            raise ValueError("Missing 'outcome' column")
+            raise TrainingDataError("Missing 'outcome' column")
 
         # Filter to completed signals only
         df = df[df["outcome"].isin(["WIN", "LOSS", 1, 0])].copy()
 
         if len(df) < MODEL_CONFIG["min_training_samples"]:
-            raise ValueError(
+            raise TrainingDataError(
                 f"Insufficient training data after filtering: {len(df)} samples, "
                 f"minimum required: {MODEL_CONFIG['min_training_samples']}"
             )
 
         # Convert outcome to binary
-        if df["outcome"].dtype == object:
+        if not pd.api.types.is_numeric_dtype(df["outcome"]):
             df["outcome"] = df["outcome"].map({"WIN": 1, "LOSS": 0})
 
-        # Extract features
-        features = df[FEATURE_NAMES].values.astype(np.float32)
-        labels = df["outcome"].values.astype(np.int32)
-
-        # Handle missing values
-        features = np.nan_to_num(features, nan=0.0)
+        # Extract features as float32 with missing values filled in the same pass
+        with _training_input():
+            features = df[FEATURE_NAMES].to_numpy(dtype=np.float32, na_value=0.0, copy=False)
+            labels = df["outcome"].to_numpy(dtype=np.int32, copy=False)
 
         # Get timestamps if available
         timestamps = None
@@ -1,22 +1,34 @@
 #!/usr/bin/env python3
 """
-Simple script to run the ML service for development.
-Usage: python run.py
+Script to run the ML service.
+Usage: python run.py                      (single worker)
+       WEB_CONCURRENCY=4 python run.py    (four worker processes)
+       ENV=dev python run.py              (single worker with auto-reload)
+
+Each worker process imports app.main and loads its own SignalClassifier from
+MODEL_DIR; compiled runtimes are built once and shared (see _runtime_lock).
+/train and /reload reach one worker; the others pick up the saved model within
+MODEL_POLL_SECONDS. Each worker's predict pool gets cores // workers threads.
 """
 
 import uvicorn
-from app.config import SERVER_HOST, SERVER_PORT
+from app.config import SERVER_HOST, SERVER_PORT, SERVER_WORKERS, DEV_MODE
 
 if __name__ == "__main__":
     print("Starting Signal Sense Hunter ML Service...")
     print(f"Server: http://{SERVER_HOST}:{SERVER_PORT}")
     print(f"Docs: http://{SERVER_HOST}:{SERVER_PORT}/docs")
+    print(f"Workers: {1 if DEV_MODE else SERVER_WORKERS}{' (reload)' if DEV_MODE else ''}")
     print("-" * 50)
 
+    # "auto" picks uvloop and httptools (uvicorn[standard]) when installed
     uvicorn.run(
         "app.main:app",
         host=SERVER_HOST,
         port=SERVER_PORT,
-        reload=True,
+        reload=DEV_MODE,
+        workers=1 if DEV_MODE else SERVER_WORKERS,
+        loop="auto",
+        http="auto",
         log_level="info",
     )